@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from . import auth  # noqa: F401
+        if getattr(settings, 'TEMPLATES_WARMUP', False):
+            from .warmup import warm_templates
+            warm_templates()
@@ -0,0 +1,34 @@
+"""Бэкенд аутентификации с кешем пользователя сессии.
+
+AuthenticationMiddleware на каждом запросе загружает пользователя по id
+из сессии. CachedModelBackend отдаёт его из кеша, а любое сохранение
+или удаление пользователя (смена пароля, правка профиля, last_login)
+сбрасывает запись. Проверка хеша пароля в сессии остаётся за Django,
+поэтому смена пароля по-прежнему разлогинивает другие сессии.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
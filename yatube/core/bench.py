@@ -0,0 +1,57 @@
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+User = get_user_model()
+
+
+@contextmanager
+def bench_database():
+    """Временная тестовая база для бенчмарков; рабочая БД не трогается."""
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed(posts=1000, users=10, groups=3):
+    from posts.models import Group, Post
+    from posts.rendering import backfill
+
+    User.objects.bulk_create(
+        User(username=f'bench_user{i}') for i in range(users)
+    )
+    authors = list(User.objects.filter(username__startswith='bench_user'))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'bench-group{i}', description='')
+        for i in range(groups)
+    )
+    group_list = list(Group.objects.filter(slug__startswith='bench-group'))
+    Post.objects.bulk_create(
+        (
+            Post(
+                text=f'Тестовый пост {i}',
+                author=authors[i % len(authors)],
+                group=group_list[i % len(group_list)] if group_list else None,
+            )
+            for i in range(posts)
+        ),
+        batch_size=500,
+    )
+    backfill(Post)
+    return authors, group_list
+
+
+def timed(func, repeat=1):
+    """Возвращает лучшее время выполнения func за repeat запусков."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
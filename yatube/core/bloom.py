@@ -0,0 +1,43 @@
+"""Фильтр Блума: компактная проверка «точно нет / возможно есть».
+
+Ложных отрицаний не бывает; доля ложных срабатываний при bits_per_item
+битах на элемент и оптимальном числе хешей — около 0.6185 ** bits_per_item
+(1 % при 10 битах). Объект пиклится целиком, его можно класть в кеш.
+"""
+import hashlib
+import math
+import struct
+
+DIGEST = struct.Struct('<QQ')
+
+
+class BloomFilter:
+    def __init__(self, capacity, bits_per_item=10):
+        self.size = max(8, capacity * bits_per_item)
+        self.hashes = max(1, round(bits_per_item * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items, bits_per_item=10):
+        items = list(items)
+        bloom = cls(len(items), bits_per_item)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def positions(self, item):
+        # Двойное хеширование: h1 + i * h2 вместо k независимых хешей.
+        h1, h2 = DIGEST.unpack(
+            hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        )
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self.positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self.positions(item)
+        )
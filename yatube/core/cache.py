@@ -0,0 +1,209 @@
+"""Кеш с защитой от одновременного пересчёта одного ключа.
+
+Значение хранится вместе с логическим сроком годности и длительностью
+последнего пересчёта, а физически живёт ещё CACHE_STALE_TIMEOUT секунд.
+Когда срок подходит к концу, ключ с вероятностью, растущей к моменту
+истечения, пересчитывается заранее (XFetch). Пересчитывает только
+процесс, взявший блокировку через cache.add; остальные в это время
+получают прежнее значение, а при пустом кеше ждут результата.
+"""
+import hashlib
+import math
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control, patch_response_headers
+
+from . import metrics
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+def is_fresh(entry, beta):
+    _, expires, delta = entry
+    # 1 - random() лежит в (0, 1], логарифм не бывает бесконечным.
+    early = delta * beta * -math.log(1 - random.random())
+    return time.time() + early < expires
+
+
+def refresh(key, build, timeout, stale):
+    start = time.time()
+    value = build()
+    if value is not None:
+        delta = time.time() - start
+        cache.set(key, (value, start + timeout, delta), timeout + stale)
+    metrics.incr('cache.rebuild')
+    return value
+
+
+def wait(key, lock):
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(lock) is None:
+            break
+    return None
+
+
+def get_or_set(key, build, timeout, stale=None, beta=None):
+    """Отдаёт значение ключа, пересчитывая его через build() не более чем
+    в одном процессе одновременно.
+
+    build() может вернуть None — такой результат не кешируется.
+    """
+    if stale is None:
+        stale = settings.CACHE_STALE_TIMEOUT
+    if beta is None:
+        beta = settings.CACHE_EARLY_BETA
+    entry = cache.get(key)
+    if entry is not None and is_fresh(entry, beta):
+        metrics.incr('cache.hit')
+        return entry[0]
+    lock = f'lock:{key}'
+    if cache.add(lock, 1, settings.CACHE_LOCK_TIMEOUT):
+        try:
+            return refresh(key, build, timeout, stale)
+        finally:
+            cache.delete(lock)
+    if entry is None:
+        entry = wait(key, lock)
+    if entry is None:
+        return refresh(key, build, timeout, stale)
+    metrics.incr('cache.stale')
+    return entry[0]
+
+
+def version(name):
+    """Текущая версия набора ключей name; bump(name) делает их старыми."""
+    key = f'version:{name}'
+    cache.add(key, 1, None)
+    return cache.get(key, 1)
+
+
+def bump(name):
+    key = f'version:{name}'
+    if not cache.add(key, 2, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def cached_response(key, render, timeout, stale=None):
+    """Ответ render() из кеша по ключу key (только 200 и не потоковые)."""
+    rendered = []
+
+    def build():
+        response = render()
+        rendered.append(response)
+        if response.status_code != 200 or response.streaming:
+            return None
+        return response.content, list(response.items())
+
+    cached = get_or_set(key, build, timeout, stale)
+    if rendered:
+        return rendered[0]
+    content, headers = cached
+    response = HttpResponse(content)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def page_hash(request):
+    return hashlib.md5(request.get_full_path().encode()).hexdigest()
+
+
+def user_pages_version(user_id):
+    return version(f'pages:{user_id}')
+
+
+def forget_user_pages(user_id):
+    """Делает старыми все страницы cached_page пользователя user_id."""
+    bump(f'pages:{user_id}')
+
+
+def cached_page(timeout, stale=None):
+    """Как cache_page, но с get_or_set: страницу пересчитывает один процесс.
+
+    Ключ зависит от полного пути и пользователя: шапка страницы у каждого
+    авторизованного пользователя своя. У авторизованного пользователя в
+    ключе ещё и версия его страниц (forget_user_pages), чтобы его действия
+    (например, лайк) сразу были видны на кешированных страницах, и
+    CSRF-cookie: токен форм в сохранённой странице подходит только к ней,
+    а get_token на каждом запросе выставляет cookie и при ответе из кеша.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            user = 0
+            if request.user.is_authenticated:
+                get_token(request)
+                csrf = hashlib.md5(
+                    request.META['CSRF_COOKIE'].encode()
+                ).hexdigest()
+                user = (
+                    f'{request.user.pk}:{user_pages_version(request.user.pk)}'
+                    f':{csrf}'
+                )
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    patch_response_headers(response, timeout)
+                return response
+
+            return cached_response(
+                f'page:{user}:{page_hash(request)}', render, timeout, stale
+            )
+        return wrapper
+    return decorator
+
+
+def permanent_page(is_past, timeout):
+    """Страницы, целиком относящиеся к прошлому, — навсегда в кеше.
+
+    is_past(request, *args, **kwargs) решает, закрыт ли запрошенный
+    период. Такие страницы для анонимных пользователей (в основном
+    роботов) отдаются с Cache-Control immutable и хранятся в кеше
+    IMMUTABLE_MAX_AGE секунд под версией 'history': правка или удаление
+    старого поста и правка или удаление группы меняют версию
+    (posts.signals). Остальные запросы
+    обслуживаются как cached_page(timeout). Пока такая страница
+    рендерится, request.is_permanent истинно: шаблоны не выводят в ней
+    то, что меняется и без правки постов (счётчики просмотров и лайков).
+    """
+    def decorator(view):
+        fallback = cached_page(timeout)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated
+                    or not is_past(request, *args, **kwargs)):
+                return fallback(request, *args, **kwargs)
+
+            def render():
+                request.is_permanent = True
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    patch_cache_control(
+                        response, public=True, immutable=True,
+                        max_age=settings.IMMUTABLE_MAX_AGE,
+                    )
+                return response
+
+            key = f'history:{version("history")}:{page_hash(request)}'
+            return cached_response(key, render, settings.IMMUTABLE_MAX_AGE)
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+"""Карта идентичности на время запроса.
+
+attach(objects, 'author', ...) собирает id ещё не загруженных связей и
+загружает их одним запросом IN, после чего каждый объект получает
+экземпляр из карты. Повторные обращения в пределах запроса (автор поста и
+авторы комментариев, пользователь из request.user) отдают тот же
+экземпляр без новых запросов. Вне запроса attach работает с временной
+картой, которая живёт только на время вызова.
+"""
+from contextvars import ContextVar
+
+_current = ContextVar('identity_map', default=None)
+
+
+def model_key(model):
+    return model._meta.concrete_model._meta.label_lower
+
+
+class IdentityMap:
+    def __init__(self):
+        self.instances = {}
+
+    def add(self, instance):
+        """Кладёт экземпляр в карту и возвращает канонический."""
+        key = (model_key(type(instance)), instance.pk)
+        return self.instances.setdefault(key, instance)
+
+    def get_many(self, model, pks):
+        label = model_key(model)
+        missing = {pk for pk in pks if (label, pk) not in self.instances}
+        if missing:
+            for instance in model._base_manager.filter(pk__in=missing):
+                self.add(instance)
+        return {
+            pk: self.instances[label, pk] for pk in pks
+            if (label, pk) in self.instances
+        }
+
+
+def current():
+    return _current.get() or IdentityMap()
+
+
+def activate(identity_map):
+    return _current.set(identity_map)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def attach(objects, *fields):
+    """Подставляет в объекты связанные экземпляры из карты идентичности.
+
+    objects — список экземпляров одной модели, fields — имена её
+    ForeignKey.
+    """
+    if not objects:
+        return objects
+    identity_map = current()
+    for name in fields:
+        field = objects[0]._meta.get_field(name)
+        pending = []
+        for obj in objects:
+            if field.is_cached(obj):
+                related = field.get_cached_value(obj)
+                if related is not None:
+                    field.set_cached_value(obj, identity_map.add(related))
+            elif getattr(obj, field.attname) is not None:
+                pending.append(obj)
+        related = identity_map.get_many(
+            field.related_model,
+            {getattr(obj, field.attname) for obj in pending},
+        )
+        for obj in pending:
+            value = related.get(getattr(obj, field.attname))
+            if value is not None:
+                field.set_cached_value(obj, value)
+    return objects
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import ASGIHandler
+from core.bench import bench_database, seed
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность WSGI и ASGI на одних данных '
+            'при медленных клиентах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument(
+            '--client-delay', type=float, default=0.25,
+            help='Время (с), которое медленный клиент тратит на обмен.'
+        )
+
+    def handle(self, *args, **options):
+        with bench_database():
+            authors, groups = seed(posts=options['posts'])
+            paths = ['/', f'/group/{groups[0].slug}/',
+                     f'/profile/{authors[0].username}/']
+            scopes = [
+                self.scope(paths[i % len(paths)])
+                for i in range(options['requests'])
+            ]
+            handler = ASGIHandler(
+                get_wsgi_application(), max_workers=options['workers']
+            )
+            cache.clear()
+            wsgi = self.run_wsgi(handler, scopes, options)
+            cache.clear()
+            asgi = asyncio.run(self.run_asgi(handler, scopes, options))
+            handler.executor.shutdown()
+        count = len(scopes)
+        self.stdout.write(f'Запросов: {count}, потоков: {options["workers"]}, '
+                          f'задержка клиента: {options["client_delay"]} с')
+        self.stdout.write(f'WSGI: {count / wsgi:8.1f} запр/с ({wsgi:.2f} с)')
+        self.stdout.write(f'ASGI: {count / asgi:8.1f} запр/с ({asgi:.2f} с)')
+
+    @staticmethod
+    def scope(path):
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+        }
+
+    @staticmethod
+    def run_wsgi(handler, scopes, options):
+        delay = options['client_delay']
+
+        def request(scope):
+            # В WSGI медленный клиент держит рабочий поток всё время обмена.
+            time.sleep(delay)
+            environ = handler.build_environ(scope, io.BytesIO())
+            return handler.call_wsgi(environ)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['workers']) as pool:
+            list(pool.map(request, scopes))
+        return time.perf_counter() - start
+
+    @staticmethod
+    async def run_asgi(handler, scopes, options):
+        delay = options['client_delay']
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def receive():
+            await asyncio.sleep(delay)
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            pass
+
+        async def request(scope):
+            async with semaphore:
+                await handler(scope, receive, send)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(scope) for scope in scopes))
+        return time.perf_counter() - start
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+PROFILES = ('yatube.settings.dev', 'yatube.settings.prod')
+STEPS = {
+    'manage.py check': [sys.executable, 'manage.py', 'check'],
+    'импорт WSGI': [sys.executable, '-c', 'import yatube.wsgi'],
+}
+
+
+class Command(BaseCommand):
+    help = ('Время запуска `manage.py check` и импорта WSGI-приложения '
+            'для профилей настроек dev и prod.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for profile in PROFILES:
+            env = dict(
+                os.environ,
+                DJANGO_SETTINGS_MODULE=profile,
+                SECRET_KEY=os.getenv('SECRET_KEY', 'bench-secret-key'),
+            )
+            for step, command in STEPS.items():
+                best = min(
+                    self.run(command, env) for _ in range(options['repeat'])
+                )
+                self.stdout.write(
+                    f'{profile:22} {step:18} {best * 1000:8.1f} мс'
+                )
+
+    @staticmethod
+    def run(command, env):
+        start = time.perf_counter()
+        subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        return time.perf_counter() - start
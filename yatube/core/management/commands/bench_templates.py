@@ -0,0 +1,71 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from core.bench import bench_database, seed, timed
+from posts.models import Post
+from posts.utils import posts_page
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def build_engine(cached):
+    params = copy.deepcopy(settings.TEMPLATES[0])
+    params.pop('BACKEND')
+    options = params.pop('OPTIONS')
+    options.pop('loaders', None)
+    if cached:
+        params['APP_DIRS'] = False
+        options['loaders'] = CACHED_LOADERS
+    else:
+        params['APP_DIRS'] = True
+    params['NAME'] = 'cached' if cached else 'uncached'
+    params['OPTIONS'] = options
+    return DjangoTemplates(params)
+
+
+class Command(BaseCommand):
+    help = ('Время рендера posts/index.html с 10 постами без кеширующего '
+            'загрузчика шаблонов и с ним.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=200)
+
+    def handle(self, *args, **options):
+        renders = options['renders']
+        with bench_database():
+            seed(posts=settings.PAGINATION_VALUE)
+            request = RequestFactory().get('/')
+            request.user = AnonymousUser()
+            page_obj = posts_page(
+                request, Post.objects.select_related('author', 'group')
+            )
+            page_obj.object_list = list(page_obj.object_list)
+            context = {'page_obj': page_obj}
+            results = {}
+            for cached in (False, True):
+                engine = build_engine(cached)
+                engine.get_template('posts/index.html').render(
+                    context, request
+                )
+
+                def render():
+                    for _ in range(renders):
+                        engine.get_template('posts/index.html').render(
+                            context, request
+                        )
+
+                results[cached] = timed(render, repeat=3) / renders
+        before, after = results[False], results[True]
+        self.stdout.write(f'Без кеша шаблонов: {before * 1000:.3f} мс/рендер')
+        self.stdout.write(f'С кешем шаблонов:  {after * 1000:.3f} мс/рендер')
+        self.stdout.write(f'Ускорение: {before / after:.1f}x')
@@ -0,0 +1,52 @@
+import pickle
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from core.bench import bench_database, seed, timed
+from posts.models import Post
+from posts.timelines import hydrate, pack, unpack
+
+WORD = 'слово '
+
+
+class Command(BaseCommand):
+    help = ('Размер ленты в кеше: pickle постов против упакованных пар '
+            '(id, pub_date) с zlib и без, и время сборки страницы из кеша.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int,
+                            default=settings.TIMELINE_LENGTH)
+        parser.add_argument('--text-words', type=int, default=100)
+
+    def handle(self, *args, **options):
+        entries = options['entries']
+        with bench_database():
+            seed(posts=entries)
+            Post.objects.update(text=WORD * options['text_words'])
+            posts = Post.objects.order_by('-pub_date', '-id')
+            rows = list(posts.values_list('id', 'pub_date'))
+            sizes = {
+                'pickle Post': len(pickle.dumps(list(posts))),
+                'pickle Post + автор и группа': len(pickle.dumps(
+                    list(posts.select_related('author', 'group'))
+                )),
+            }
+            with override_settings(TIMELINE_COMPRESS_MIN=float('inf')):
+                sizes['упакованные пары'] = len(pack(entries, rows))
+            with override_settings(TIMELINE_COMPRESS_MIN=0):
+                packed = pack(entries, rows)
+                sizes['упакованные пары + zlib'] = len(packed)
+            for name, size in sizes.items():
+                self.stdout.write(
+                    f'{name:30} {size:10} байт '
+                    f'{size / entries:8.1f} байт/запись'
+                )
+            _, head = unpack(packed)
+            ids = [pk for pk, _ in head[:settings.PAGINATION_VALUE]]
+            hydrate(ids)
+            best = timed(lambda: hydrate(ids), repeat=20)
+            self.stdout.write(
+                f'Страница из кеша постов: {best * 1000:.3f} мс'
+            )
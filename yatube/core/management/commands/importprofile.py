@@ -0,0 +1,73 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """Разбирает вывод `python -X importtime`: (модуль, собств., суммарн.)."""
+    for line in output.splitlines():
+        match = LINE.match(line)
+        if match:
+            own, cumulative, _, module = match.groups()
+            yield module, int(own), int(cumulative)
+
+
+class Command(BaseCommand):
+    help = ('Отчёт о стоимости импорта модулей при загрузке '
+            'WSGI-приложения (python -X importtime).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='yatube.wsgi')
+        parser.add_argument(
+            '--settings-module',
+            default=os.getenv('DJANGO_SETTINGS_MODULE', 'yatube.settings'),
+        )
+        parser.add_argument('--top', type=int, default=25)
+
+    def handle(self, *args, **options):
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE=options['settings_module']
+        )
+        env.setdefault('SECRET_KEY', 'import-profile-secret-key')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             f'import {options["module"]}'],
+            cwd=settings.BASE_DIR, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        modules = list(parse_importtime(result.stderr))
+        total = sum(own for _, own, _ in modules)
+        packages = defaultdict(int)
+        for module, own, _ in modules:
+            packages[module.split('.')[0]] += own
+        top = options['top']
+        self.stdout.write(
+            f'{options["module"]} ({options["settings_module"]}): '
+            f'{len(modules)} модулей, {total / 1000:.1f} мс'
+        )
+        self.stdout.write('\nПакеты (собственное время модулей):')
+        for package, own in sorted(
+            packages.items(), key=lambda item: -item[1]
+        )[:top]:
+            self.stdout.write(
+                f'{own / 1000:9.1f} мс {own * 100 / total:5.1f}%  {package}'
+            )
+        self.stdout.write('\nМодули (с учётом вложенных импортов):')
+        for module, _, cumulative in sorted(
+            modules, key=lambda item: -item[2]
+        )[:top]:
+            self.stdout.write(f'{cumulative / 1000:9.1f} мс  {module}')
+        if 'pkg_resources' in packages:
+            self.stdout.write(
+                '\npkg_resources загружается заглушкой distutils из '
+                'setuptools; SETUPTOOLS_USE_DISTUTILS=stdlib в окружении '
+                'воркера убирает этот импорт.'
+            )
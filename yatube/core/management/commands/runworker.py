@@ -0,0 +1,46 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils.module_loading import autodiscover_modules
+
+from core.tasks import claim_pending, execute
+
+
+def execute_in_thread(task_row):
+    try:
+        return execute(task_row)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Число потоков, выполняющих задачи.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Пауза (с) между опросами пустой очереди.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.'
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules('tasks')
+        concurrency = options['concurrency']
+        with ThreadPoolExecutor(concurrency) as pool:
+            while True:
+                batch = claim_pending(limit=concurrency * 2)
+                for status in pool.map(execute_in_thread, batch):
+                    self.stdout.write(status, ending='\n')
+                if options['once'] and not batch:
+                    return
+                if not batch:
+                    time.sleep(options['poll_interval'])
@@ -0,0 +1,44 @@
+"""Простые счётчики процесса для отчётов о производительности."""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+
+
+def incr(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+@contextmanager
+def timer(name):
+    """Копит суммарное время (name.seconds) и число замеров (name.count)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _counters[f'{name}.seconds'] += time.perf_counter() - start
+            _counters[f'{name}.count'] += 1
+
+
+def get(name):
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot(prefix=''):
+    with _lock:
+        return {
+            name: value for name, value in sorted(_counters.items())
+            if name.startswith(prefix)
+        }
+
+
+def reset(prefix=''):
+    with _lock:
+        for name in [name for name in _counters if name.startswith(prefix)]:
+            del _counters[name]
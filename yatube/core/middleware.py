@@ -0,0 +1,39 @@
+from django.http import HttpResponseNotAllowed
+
+from . import loaders
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadOnlyMiddleware:
+    """Отклоняет запросы на запись: воркер обслуживает только чтение."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in SAFE_METHODS:
+            return HttpResponseNotAllowed(SAFE_METHODS)
+        return self.get_response(request)
+
+
+class IdentityMapMiddleware:
+    """Заводит карту идентичности (core.loaders) на время запроса.
+
+    Авторизованный пользователь сразу попадает в карту, поэтому его посты
+    и комментарии получают тот же экземпляр, что и request.user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        identity_map = loaders.IdentityMap()
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            identity_map.add(getattr(user, '_wrapped', user))
+        token = loaders.activate(identity_map)
+        try:
+            return self.get_response(request)
+        finally:
+            loaders.deactivate(token)
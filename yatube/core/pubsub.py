@@ -0,0 +1,58 @@
+"""Публикация событий подписчикам в пределах процесса.
+
+Подписчики — соединения, которые ждут в цикле событий ASGI: у каждого
+своя asyncio.Queue, а хаб хранит для канала множество очередей. Ожидающее
+соединение ничего не стоит, кроме очереди и записи в словаре каналов.
+Публикация потокобезопасна: из потока представления событие передаётся
+в цикл через call_soon_threadsafe и раскладывается по очередям там же.
+Если очередь подписчика переполнена (клиент не успевает читать), событие
+для него отбрасывается. События видят только соединения этого процесса.
+"""
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import metrics
+
+
+class Hub:
+    def __init__(self):
+        self.channels = defaultdict(set)
+        self.loop = None
+
+    @contextmanager
+    def subscribe(self, channels):
+        """Очередь событий каналов channels на время блока with."""
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=settings.PUBSUB_QUEUE_SIZE)
+        for channel in channels:
+            self.channels[channel].add(queue)
+        metrics.incr('pubsub.subscribers')
+        try:
+            yield queue
+        finally:
+            for channel in channels:
+                queues = self.channels.get(channel)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        del self.channels[channel]
+            metrics.incr('pubsub.subscribers', -1)
+
+    def publish(self, channel, event):
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.deliver, channel, event)
+
+    def deliver(self, channel, event):
+        for queue in self.channels.get(channel, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                metrics.incr('pubsub.dropped')
+
+
+hub = Hub()
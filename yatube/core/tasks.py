@@ -0,0 +1,192 @@
+"""Фоновые задачи для побочных эффектов записи.
+
+Брокер выбирается настройкой TASK_BROKER:
+- 'db' — задачи сохраняются в таблицу Task в той же транзакции, что и
+  запись; выполняет их команда ``manage.py runworker``, задачу упавшего
+  воркера захватывает снова через TASK_LEASE_TIMEOUT секунд;
+- 'local' — пул потоков текущего процесса, запуск после коммита;
+- 'eager' — синхронное выполнение (тесты, отладка).
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+_local_executor = None
+_local_keys = OrderedDict()
+_local_lock = threading.Lock()
+LOCAL_KEYS_LIMIT = 10000
+
+
+def task(name=None, max_retries=None):
+    """Регистрирует функцию как фоновую задачу и добавляет ей .delay()."""
+    def decorator(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_retries = (
+            settings.TASK_MAX_RETRIES if max_retries is None else max_retries
+        )
+        func.delay = (
+            lambda *args, key=None: enqueue(func.task_name, *args, key=key)
+        )
+        registry[func.task_name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    if name not in registry:
+        autodiscover_modules('tasks')
+    return registry[name]
+
+
+def backoff(attempts):
+    return timedelta(seconds=settings.TASK_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def enqueue(name, *args, key=None):
+    """Ставит задачу в очередь; повтор с тем же key игнорируется."""
+    broker = settings.TASK_BROKER
+    if broker == 'eager':
+        return run_local(name, args)
+    if broker == 'db':
+        try:
+            with transaction.atomic():
+                Task.objects.create(name=name, args=json.dumps(args), key=key)
+        except IntegrityError:
+            logger.debug('Задача %s с ключом %s уже в очереди', name, key)
+        return None
+    if broker == 'local':
+        def submit():
+            # Ключ запоминается только после коммита: при откате транзакции
+            # повтор той же задачи не должен отбрасываться.
+            if key is None or _remember_key(key):
+                _get_local_executor().submit(run_local, name, args)
+
+        transaction.on_commit(submit)
+        return None
+    raise ValueError(f'Неизвестный брокер задач: {broker}')
+
+
+def _remember_key(key):
+    with _local_lock:
+        if key in _local_keys:
+            return False
+        _local_keys[key] = True
+        if len(_local_keys) > LOCAL_KEYS_LIMIT:
+            _local_keys.popitem(last=False)
+        return True
+
+
+def _get_local_executor():
+    global _local_executor
+    with _local_lock:
+        if _local_executor is None:
+            _local_executor = ThreadPoolExecutor(
+                max_workers=settings.TASK_LOCAL_WORKERS,
+                thread_name_prefix='tasks',
+            )
+        return _local_executor
+
+
+def run_local(name, args):
+    func = get_task(name)
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return func(*args)
+        except Exception:
+            if attempts > func.max_retries:
+                logger.exception('Задача %s завершилась ошибкой', name)
+                if settings.TASK_BROKER == 'eager':
+                    raise
+                return None
+            time.sleep(backoff(attempts).total_seconds())
+        finally:
+            if settings.TASK_BROKER != 'eager':
+                close_old_connections()
+
+
+def claim_pending(limit):
+    """Захватывает до limit готовых задач условным UPDATE (без блокировок).
+
+    Готовы задачи в очереди и задачи, захват которых старше
+    TASK_LEASE_TIMEOUT секунд; повторный захват считается попыткой.
+    """
+    now = timezone.now()
+    expired = Q(
+        status=Task.RUNNING,
+        claimed_at__lt=now - timedelta(seconds=settings.TASK_LEASE_TIMEOUT),
+    )
+    ready = Q(status=Task.PENDING, run_at__lte=now) | expired
+    claimed = []
+    for pk in Task.objects.filter(ready).values_list('pk', flat=True)[:limit]:
+        if Task.objects.filter(ready, pk=pk).update(
+            status=Task.RUNNING,
+            claimed_at=now,
+            attempts=Case(
+                When(expired, then=F('attempts') + 1),
+                default=F('attempts'),
+            ),
+        ):
+            claimed.append(pk)
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def execute(task_row):
+    try:
+        func = get_task(task_row.name)
+    except KeyError:
+        func = None
+    if func is not None and task_row.attempts > func.max_retries:
+        # Воркеры, захватившие задачу, не завершили её max_retries + 1 раз.
+        task_row.status = Task.FAILED
+        task_row.last_error = 'Истёк срок захвата'
+        logger.error('Задача %s: истёк срок захвата', task_row)
+    else:
+        try:
+            get_task(task_row.name)(*json.loads(task_row.args))
+        except Exception as error:
+            task_row.attempts += 1
+            task_row.last_error = repr(error)
+            if func is None or task_row.attempts > func.max_retries:
+                logger.exception('Задача %s завершилась ошибкой', task_row)
+                task_row.status = Task.FAILED
+            else:
+                task_row.status = Task.PENDING
+                task_row.run_at = timezone.now() + backoff(task_row.attempts)
+        else:
+            task_row.status = Task.DONE
+    # Пока задача выполнялась, срок захвата мог истечь, и её уже захватил
+    # другой воркер: итог записывает только владелец текущего захвата.
+    saved = Task.objects.filter(
+        pk=task_row.pk, claimed_at=task_row.claimed_at
+    ).update(
+        status=task_row.status,
+        attempts=task_row.attempts,
+        run_at=task_row.run_at,
+        last_error=task_row.last_error,
+    )
+    if not saved:
+        logger.warning('Задачу %s уже захватил другой воркер', task_row)
+    return task_row.status
+
+
+def run_pending(limit=100):
+    """Выполняет готовые задачи из БД в текущем потоке."""
+    return [execute(task_row) for task_row in claim_pending(limit)]
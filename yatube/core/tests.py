@@ -0,0 +1,322 @@
+import asyncio
+import copy
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.wsgi import get_wsgi_application
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from .asgi import ASGIHandler
+from .auth import user_cache_key
+from .bloom import BloomFilter
+from .cache import bump, cached_page, get_or_set, version
+from .management.commands.importprofile import parse_importtime
+from .middleware import ReadOnlyMiddleware
+from .models import Task
+from . import tasks
+from .tasks import claim_pending, enqueue, execute, run_pending, task
+from .warmup import warm_templates
+
+User = get_user_model()
+
+ABOUT_URL = '/about/author/'
+
+CALLS = []
+
+
+@task(name='core.tests.record', max_retries=0)
+def record(value):
+    CALLS.append(value)
+
+
+@task(name='core.tests.patient', max_retries=1)
+def patient(value):
+    CALLS.append(value)
+
+
+@task(name='core.tests.flaky', max_retries=1)
+def flaky():
+    raise RuntimeError('Ошибка задачи')
+
+
+CACHED_TEMPLATES = copy.deepcopy(settings.TEMPLATES)
+CACHED_TEMPLATES[0]['APP_DIRS'] = False
+CACHED_TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def asgi_request(handler, path, method='GET', body=b''):
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(handler(scope, receive, send))
+    return messages
+
+
+class ASGIHandlerTests(TestCase):
+    def setUp(self):
+        self.handler = ASGIHandler(get_wsgi_application(), max_workers=2)
+
+    def tearDown(self):
+        self.handler.executor.shutdown()
+
+    def test_wsgi_view_served_through_pool(self):
+        start, body = asgi_request(self.handler, '/about/tech/')
+        self.assertEqual(start['status'], HTTPStatus.OK)
+        self.assertIn((b'content-type', b'text/html; charset=utf-8'),
+                      start['headers'])
+        self.assertIn('Yatube', body['body'].decode())
+
+    def test_streaming_response_sent_in_chunks(self):
+        closed = []
+
+        def chunks():
+            try:
+                yield from (b'a', b'', b'b')
+            finally:
+                closed.append(True)
+
+        def application(environ, start_response):
+            response = StreamingHttpResponse(chunks())
+            start_response('200 OK', list(response.items()))
+            return response
+
+        handler = ASGIHandler(application, max_workers=1)
+        start, *bodies = asgi_request(handler, '/stream/')
+        handler.executor.shutdown()
+        self.assertEqual(start['status'], HTTPStatus.OK)
+        self.assertEqual(
+            [(body['body'], body.get('more_body', False)) for body in bodies],
+            [(b'a', True), (b'b', True), (b'', False)],
+        )
+        self.assertEqual(closed, [True])
+
+    def test_async_route(self):
+        @self.handler.route('/ping/')
+        async def ping(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': []})
+            await send({'type': 'http.response.body', 'body': b'pong'})
+
+        start, body = asgi_request(self.handler, '/ping/')
+        self.assertEqual(start['status'], HTTPStatus.OK)
+        self.assertEqual(body['body'], b'pong')
+
+
+@override_settings(TASK_BROKER='db', TASK_RETRY_DELAY=0)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_idempotency_key(self):
+        record.delay(1, key='record:1')
+        record.delay(1, key='record:1')
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(run_pending(), [Task.DONE])
+        self.assertEqual(CALLS, [1])
+        record.delay(1, key='record:1')
+        self.assertEqual(run_pending(), [])
+
+    def test_retries_then_fails(self):
+        enqueue('core.tests.flaky')
+        self.assertEqual(run_pending(), [Task.PENDING])
+        self.assertEqual(run_pending(), [Task.FAILED])
+        task_row = Task.objects.get()
+        self.assertEqual(task_row.attempts, 2)
+        self.assertIn('Ошибка задачи', task_row.last_error)
+
+    def expire_leases(self):
+        Task.objects.update(
+            claimed_at=timezone.now() - timedelta(seconds=61)
+        )
+
+    @override_settings(TASK_LEASE_TIMEOUT=60)
+    def test_expired_lease_is_reclaimed(self):
+        patient.delay(4)
+        self.assertEqual(len(claim_pending(10)), 1)
+        self.assertEqual(claim_pending(10), [])
+        self.expire_leases()
+        self.assertEqual(run_pending(), [Task.DONE])
+        self.assertEqual(CALLS, [4])
+        self.assertEqual(Task.objects.get().attempts, 1)
+
+    @override_settings(TASK_LEASE_TIMEOUT=60)
+    def test_lost_task_fails_after_retries(self):
+        patient.delay(5)
+        claim_pending(10)
+        self.expire_leases()
+        claim_pending(10)
+        self.expire_leases()
+        self.assertEqual(run_pending(), [Task.FAILED])
+        self.assertEqual(CALLS, [])
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    @override_settings(TASK_LEASE_TIMEOUT=60)
+    def test_stale_run_does_not_overwrite_new_claim(self):
+        patient.delay(6)
+        [stale] = claim_pending(10)
+        self.expire_leases()
+        [fresh] = claim_pending(10)
+        with self.assertLogs('core.tasks', 'WARNING'):
+            execute(stale)
+        task_row = Task.objects.get()
+        self.assertEqual(task_row.status, Task.RUNNING)
+        self.assertEqual(task_row.claimed_at, fresh.claimed_at)
+        self.assertEqual(execute(fresh), Task.DONE)
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    @override_settings(TASK_BROKER='local')
+    def test_local_key_is_kept_only_after_commit(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record.delay(3, key='record:3')
+                raise RuntimeError('Откат')
+        self.assertNotIn('record:3', tasks._local_keys)
+
+    @override_settings(TASK_BROKER='eager')
+    def test_eager_broker_runs_immediately(self):
+        record.delay(2)
+        self.assertEqual(CALLS, [2])
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class TemplateWarmupTests(TestCase):
+    def test_templates_are_cached_after_warmup(self):
+        self.assertGreater(warm_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        for name in ('base.html', 'includes/header.html',
+                     'posts/includes/post_card.html', 'posts/index.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, loader.get_template_cache)
+
+
+class ImportProfileTests(TestCase):
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   sorl.thumbnail\n'
+            'import time:        30 |        150 | yatube.wsgi\n'
+        )
+        self.assertEqual(list(parse_importtime(output)), [
+            ('sorl.thumbnail', 120, 120),
+            ('yatube.wsgi', 30, 150),
+        ])
+
+
+class ReadOnlyMiddlewareTests(TestCase):
+    def test_unsafe_methods_rejected(self):
+        middleware = ReadOnlyMiddleware(lambda request: HttpResponse('ok'))
+        factory = RequestFactory()
+        self.assertEqual(middleware(factory.get('/')).status_code, 200)
+        self.assertEqual(
+            middleware(factory.post('/create/')).status_code, 405
+        )
+
+
+class CachedAuthTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        self.authorized_client.get(ABOUT_URL)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(ABOUT_URL)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_password_change_resets_cached_user(self):
+        self.authorized_client.get(ABOUT_URL)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.id)))
+        user = User.objects.get(id=self.user.id)
+        user.set_password('new-password')
+        user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.id)))
+        response = self.authorized_client.get(ABOUT_URL)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+
+class SingleFlightCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = []
+
+    def build(self):
+        self.builds.append(1)
+        return len(self.builds)
+
+    def test_fresh_value_is_not_rebuilt(self):
+        self.assertEqual(get_or_set('key', self.build, 60), 1)
+        self.assertEqual(get_or_set('key', self.build, 60), 1)
+        self.assertEqual(len(self.builds), 1)
+
+    def test_expired_value_is_rebuilt(self):
+        cache.set('key', ('old', time.time() - 1, 0), 60)
+        self.assertEqual(get_or_set('key', self.build, 60), 1)
+
+    def test_stale_value_served_while_locked(self):
+        cache.set('key', ('old', time.time() - 1, 0), 60)
+        cache.add('lock:key', 1)
+        self.assertEqual(get_or_set('key', self.build, 60), 'old')
+        self.assertEqual(self.builds, [])
+
+    def test_bump_changes_version(self):
+        first = version('list')
+        bump('list')
+        self.assertNotEqual(version('list'), first)
+
+    def test_cached_page_renders_once(self):
+        calls = []
+
+        @cached_page(60)
+        def view(request):
+            calls.append(request)
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.assertEqual(view(request).content, b'ok')
+        self.assertEqual(view(request).content, b'ok')
+        self.assertEqual(len(calls), 1)
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter.from_items(range(0, 2000, 2))
+        self.assertTrue(all(item in bloom for item in range(0, 2000, 2)))
+        false_positives = sum(
+            item in bloom for item in range(1, 20000, 2)
+        )
+        self.assertLess(false_positives, 300)
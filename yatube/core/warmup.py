@@ -0,0 +1,33 @@
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def template_names(dirs):
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Компилирует все шаблоны, чтобы кеширующий загрузчик их запомнил."""
+    warmed = 0
+    dirs = set(get_app_template_dirs('templates'))
+    for engine in engines.all():
+        for name in template_names(set(engine.dirs) | dirs):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                logger.warning('Шаблон %s не компилируется: %s', name, error)
+            else:
+                warmed += 1
+    return warmed
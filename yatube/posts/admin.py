@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Comment, Follow, Group, Post
+from .models import (Comment, Follow, Group, GroupFollow, NotificationDigest,
+                     Post, Tag)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -20,13 +21,33 @@ class FollowAdmin(admin.ModelAdmin):
     search_fields = ('user', 'author',)
 
 
+class GroupFollowAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'user', 'group',)
+    search_fields = ('user__username', 'group__title',)
+
+
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('pk', 'post', 'author', 'text', 'created')
     search_fields = ('author', 'post', 'text',)
     list_filter = ('created',)
 
 
+class NotificationDigestAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'period_end', 'posts', 'emails', 'duration', 'is_finished'
+    )
+    list_filter = ('period_end',)
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'posts_count')
+    search_fields = ('name',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(GroupFollow, GroupFollowAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(NotificationDigest, NotificationDigestAdmin)
+admin.site.register(Tag, TagAdmin)
@@ -3,3 +3,17 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+
+class PostsFeedConfig(PostsConfig):
+    """Конфигурация для воркеров ленты, которые только читают.
+
+    Обработчики сигналов записи (ленты, сводки групп) не подключаются,
+    поэтому загрузка каждого поста обходится без обработчика post_init.
+    """
+
+    def ready(self):
+        pass
@@ -0,0 +1,52 @@
+"""Архив постов по месяцам и признаки «период уже закрыт».
+
+Месяц закрыт, когда он целиком прошёл: новые посты получают текущую
+дату, поэтому список закрытого месяца меняет только правка или удаление
+старого поста. Такие страницы (и порции прокрутки, курсор которых
+старше текущего месяца) отдаются через core.cache.permanent_page.
+"""
+from datetime import datetime
+
+from django.http import Http404
+from django.utils import timezone
+
+from .utils import decode_cursor
+
+
+def month_bounds(year, month):
+    """Начало месяца и начало следующего в текущем часовом поясе."""
+    if not (1 <= month <= 12 and 1 <= year < 9999):
+        raise Http404('Нет такого месяца')
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+    return start, end
+
+
+def current_month_start():
+    now = timezone.localtime()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def is_historical(pub_date):
+    return pub_date < current_month_start()
+
+
+def month_is_closed(request, year, month, **kwargs):
+    try:
+        _, end = month_bounds(year, month)
+    except Http404:
+        return False
+    return end <= current_month_start()
+
+
+def cursor_is_closed(request, **kwargs):
+    cursor = request.GET.get('cursor')
+    if not cursor:
+        return False
+    try:
+        pub_date, _ = decode_cursor(cursor)
+    except ValueError:
+        # Испорченный курсор (в том числе вне диапазона дат) отклонит
+        # само представление — ответом 404.
+        return False
+    return is_historical(pub_date)
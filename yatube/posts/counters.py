@@ -0,0 +1,159 @@
+"""Счётчики просмотров постов.
+
+Просмотр не пишет в БД: он увеличивает счётчик в памяти процесса.
+Раз в VIEW_FLUSH_INTERVAL секунд (или при VIEW_FLUSH_SIZE разных постов)
+накопленное сбрасывается в Post.views пачкой UPDATE — по одному на каждое
+встречающееся значение прироста — в одной транзакции; тем же сбросом
+начисляется вес просмотров в популярности (posts.trending). Карточки
+берут число просмотров из кеша (get_many на страницу), промахи — одним
+запросом, и добавляют ещё не сброшенные просмотры этого процесса.
+
+Фоновый сброс по таймеру и сброс при остановке включает только сервер
+(yatube.wsgi, yatube.asgi) через install(): в тестах и командах
+manage.py буфер сам в базу при выходе не пишет.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+from core import metrics
+
+from . import trending
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def views_cache_key(post_id):
+    return f'views:{post_id}'
+
+
+class ViewBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.started = time.monotonic()
+
+    def add(self, post_id):
+        with self.lock:
+            self.pending[post_id] += 1
+            due = (
+                len(self.pending) >= settings.VIEW_FLUSH_SIZE
+                or time.monotonic() - self.started
+                >= settings.VIEW_FLUSH_INTERVAL
+            )
+        if due:
+            try:
+                self.flush()
+            except DatabaseError:
+                # Просмотры вернулись в буфер; зритель не должен получить
+                # ошибку из-за чужих счётчиков.
+                logger.exception('Не удалось записать просмотры')
+
+    def get(self, post_id):
+        with self.lock:
+            return self.pending.get(post_id, 0)
+
+    def take(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.started = time.monotonic()
+        return pending
+
+    def restore(self, pending):
+        with self.lock:
+            self.pending.update(pending)
+
+    def flush(self):
+        """Записывает накопленные просмотры в БД, отдаёт их число.
+
+        Если запись не удалась, просмотры возвращаются в буфер.
+        """
+        pending = self.take()
+        if not pending:
+            return 0
+        try:
+            self.write(pending)
+        except Exception:
+            self.restore(pending)
+            raise
+        cache.delete_many([views_cache_key(pk) for pk in pending])
+        total = sum(pending.values())
+        metrics.incr('views.flushes')
+        metrics.incr('views.flushed', total)
+        return total
+
+    @staticmethod
+    def write(pending):
+        by_increment = defaultdict(list)
+        for post_id, count in pending.items():
+            by_increment[count].append(post_id)
+        with transaction.atomic():
+            for count, post_ids in by_increment.items():
+                Post.objects.filter(id__in=post_ids).update(
+                    views=F('views') + count
+                )
+            # Пост могли удалить, пока его просмотры копились в буфере.
+            existing = Post.objects.filter(id__in=list(pending)).values_list(
+                'id', flat=True
+            )
+            trending.record_many({
+                post_id: pending[post_id] * settings.TRENDING_VIEW_WEIGHT
+                for post_id in existing
+            })
+
+
+buffer = ViewBuffer()
+
+
+def flush_quietly():
+    try:
+        buffer.flush()
+    except DatabaseError:
+        logger.exception('Не удалось записать просмотры')
+
+
+def run_flusher():
+    while True:
+        time.sleep(settings.VIEW_FLUSH_INTERVAL)
+        flush_quietly()
+
+
+def install():
+    """Сброс буфера по таймеру и при остановке процесса сервера."""
+    threading.Thread(
+        target=run_flusher, name='view-flusher', daemon=True
+    ).start()
+    atexit.register(flush_quietly)
+
+
+def hit(post_id):
+    buffer.add(post_id)
+
+
+def attach_views(posts):
+    """Проставляет постам view_count: сохранённые и ещё не сброшенные."""
+    keys = {views_cache_key(post.id): post.id for post in posts}
+    counts = {
+        keys[key]: count for key, count in cache.get_many(list(keys)).items()
+    }
+    missing = [pk for pk in keys.values() if pk not in counts]
+    if missing:
+        loaded = dict(
+            Post.objects.filter(id__in=missing).values_list('id', 'views')
+        )
+        cache.set_many(
+            {views_cache_key(pk): count for pk, count in loaded.items()},
+            settings.VIEW_COUNT_TIMEOUT,
+        )
+        counts.update(loaded)
+    for post in posts:
+        post.view_count = counts.get(post.id, 0) + buffer.get(post.id)
+    return posts
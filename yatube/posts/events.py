@@ -0,0 +1,163 @@
+"""Поток событий (SSE) для ленты подписок и страницы поста.
+
+GET /events/ — для авторизованного пользователя события «новые посты»
+его авторов и групп: event: posts с числом новых постов с момента
+подключения. GET /events/?post=<id> — новые комментарии поста: event:
+comment с HTML комментария. Обработчик работает в цикле событий ASGI
+(yatube.asgi) и ждёт события из core.pubsub, поток под соединение не
+занимается; запросы к БД при подключении идут в пул потоков обработчика.
+Посты и комментарии публикуются после фиксации транзакции
+(posts.signals). Под WSGI по тому же адресу отвечает unavailable: 204,
+и EventSource больше не переподключается.
+"""
+import asyncio
+import json
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.db import close_old_connections, transaction
+from django.http import HttpResponse
+from django.urls import reverse
+
+from core.pubsub import hub
+
+from .models import Follow, GroupFollow
+
+HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+
+def post_channels(post):
+    channels = [f'author:{post.author_id}']
+    if post.group_id is not None:
+        channels.append(f'group:{post.group_id}')
+    return channels
+
+
+def publish_post(post):
+    def send():
+        for channel in post_channels(post):
+            hub.publish(channel, ('post', post.id, None))
+
+    transaction.on_commit(send)
+
+
+def publish_comment(comment):
+    message = format_event('comment', {
+        'id': comment.id,
+        'author': comment.author.username,
+        'profile_url': reverse(
+            'posts:profile', kwargs={'username': comment.author.username}
+        ),
+        'html': comment.text_html,
+    })
+
+    def send():
+        hub.publish(
+            f'post:{comment.post_id}', ('comment', comment.id, message)
+        )
+
+    transaction.on_commit(send)
+
+
+def format_event(name, data):
+    payload = json.dumps(data, ensure_ascii=False)
+    return f'event: {name}\ndata: {payload}\n\n'.encode()
+
+
+def session_user_id(headers):
+    cookies = {}
+    for name, value in headers:
+        if name == b'cookie':
+            for item in value.decode('latin-1').split(';'):
+                key, _, cookie = item.strip().partition('=')
+                cookies[key] = cookie
+    session_key = cookies.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None
+    engine = import_module(settings.SESSION_ENGINE)
+    return engine.SessionStore(session_key).get(SESSION_KEY)
+
+
+def subscriptions(scope):
+    """Каналы соединения или None, если подписаться нельзя."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    try:
+        if 'post' in query:
+            return [f'post:{int(query["post"][0])}']
+        user_id = session_user_id(scope.get('headers', []))
+        if user_id is None:
+            return None
+        authors = Follow.objects.filter(user_id=user_id).values_list(
+            'author_id', flat=True
+        )
+        groups = GroupFollow.objects.filter(user_id=user_id).values_list(
+            'group_id', flat=True
+        )
+        return (
+            [f'author:{pk}' for pk in authors]
+            + [f'group:{pk}' for pk in groups]
+        )
+    except ValueError:
+        return None
+    finally:
+        close_old_connections()
+
+
+async def wait_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+def unavailable(request):
+    return HttpResponse(status=204)
+
+
+async def stream(scope, receive, send, run_sync):
+    """run_sync — ASGIHandler.run_sync: ограниченный пул потоков."""
+    channels = await run_sync(subscriptions, scope)
+    if channels is None:
+        await send({'type': 'http.response.start', 'status': 403,
+                    'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': HEADERS})
+    # Пост из группы своего автора приходит по двум каналам — считаем раз.
+    seen_posts = set()
+    with hub.subscribe(channels) as queue:
+        disconnect = asyncio.ensure_future(wait_disconnect(receive))
+        try:
+            while True:
+                event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {event, disconnect},
+                    timeout=settings.SSE_HEARTBEAT,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if event not in done:
+                    event.cancel()
+                    if disconnect in done:
+                        return
+                    body = b': ping\n\n'
+                else:
+                    kind, pk, message = event.result()
+                    if kind == 'post':
+                        if pk in seen_posts:
+                            continue
+                        seen_posts.add(pk)
+                        message = format_event(
+                            'posts', {'count': len(seen_posts)}
+                        )
+                    body = message
+                await send({'type': 'http.response.body', 'body': body,
+                            'more_body': True})
+        finally:
+            disconnect.cancel()
@@ -0,0 +1,170 @@
+"""Гибридная лента подписок.
+
+Посты авторов с числом подписчиков меньше FEED_FANOUT_THRESHOLD
+раскладываются по лентам подписчиков (FeedEntry, push). Посты популярных
+авторов и ещё не разосланные посты читаются при запросе (pull). Посты
+групп, на которые подписан пользователь, читаются отдельным источником
+без постов его авторов, чтобы пост, подходящий по обоим признакам, не
+попал в ленту дважды. Источники сливаются k-way merge по дате публикации.
+"""
+import heapq
+import itertools
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from core import metrics
+
+from .models import FeedEntry, Follow, GroupFollow, Post
+from .pagination import older_than
+
+
+def is_hot(author_id):
+    followers = Follow.objects.filter(author_id=author_id).count()
+    return followers >= settings.FEED_FANOUT_THRESHOLD
+
+
+def push(post):
+    """Добавляет пост в ленты подписчиков, у которых его ещё нет."""
+    followers = Follow.objects.filter(author_id=post.author_id).exclude(
+        user_id__in=FeedEntry.objects.filter(post=post).values('user_id')
+    ).values_list('user_id', flat=True).iterator()
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+            for user_id in followers
+        ),
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def fan_out(post):
+    """Раскладывает пост по лентам подписчиков, если автор не популярен.
+
+    Отдаёт число действительно добавленных записей ленты.
+    """
+    if is_hot(post.author_id):
+        metrics.incr('feed.pull.posts')
+        return 0
+    entries = FeedEntry.objects.filter(post=post)
+    before = entries.count()
+    with transaction.atomic():
+        push(post)
+        Post.objects.filter(id=post.id).update(fanned_out=True)
+    # Подписка, закоммиченная во время рассылки, могла не попасть ни в
+    # рассылку, ни в backfill, который ещё видел пост неразосланным.
+    push(post)
+    added = entries.count() - before
+    metrics.incr('feed.push.posts')
+    metrics.incr('feed.push.entries', added)
+    return added
+
+
+def backfill(user_id, author_id):
+    """Добавляет в ленту нового подписчика уже разосланные посты автора.
+
+    Вызывается после коммита подписки (posts.tasks.backfill_feed), чтобы
+    повторный проход fan_out уже видел подписку.
+    """
+    posts = Post.objects.filter(
+        author_id=author_id, fanned_out=True
+    ).values_list('id', 'pub_date').iterator()
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for post_id, pub_date in posts
+        ),
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def drop(user_id, author_id):
+    FeedEntry.objects.filter(
+        user_id=user_id, post__author_id=author_id
+    ).delete()
+
+
+class MergedTimeline:
+    """Последовательность для Paginator: слияние упорядоченных источников.
+
+    Каждый источник — queryset постов, отсортированный по убыванию
+    (pub_date, id). Для среза [start:stop] из каждого источника читается не
+    больше stop строк; дубликаты отбрасываются.
+    """
+
+    ordered = True
+
+    def __init__(self, **sources):
+        self.sources = sources
+
+    def count(self):
+        return sum(source.count() for source in self.sources.values())
+
+    def older_than(self, pub_date, pk):
+        return MergedTimeline(**{
+            name: older_than(source, pub_date, pk)
+            for name, source in self.sources.items()
+        })
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        streams = []
+        for name, source in self.sources.items():
+            rows = list(source[:stop])
+            metrics.incr(f'feed.{name}.rows', len(rows))
+            streams.append(rows)
+        merged = heapq.merge(
+            *streams, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+        return list(itertools.islice(unique(merged), start, stop))
+
+
+def unique(posts):
+    seen = set()
+    for post in posts:
+        if post.id not in seen:
+            seen.add(post.id)
+            yield post
+
+
+def follow_timeline(user):
+    if settings.FEED_MODE != 'hybrid':
+        return Post.objects.filter(
+            Q(author_id__in=Follow.objects.filter(user=user).values(
+                'author_id'
+            ))
+            | Q(group_id__in=GroupFollow.objects.filter(user=user).values(
+                'group_id'
+            ))
+        ).defer('text')
+    authors = list(
+        Follow.objects.filter(user=user).values_list('author_id', flat=True)
+    )
+    groups = list(
+        GroupFollow.objects.filter(user=user).values_list(
+            'group_id', flat=True
+        )
+    )
+    sources = {
+        'push': Post.objects.filter(
+            feed_entries__user=user
+        ).order_by('-feed_entries__pub_date', '-id').defer('text'),
+        'pull': Post.objects.filter(
+            author_id__in=authors, fanned_out=False
+        ).order_by('-pub_date', '-id').defer('text'),
+    }
+    if groups:
+        sources['groups'] = Post.objects.filter(
+            group_id__in=groups
+        ).exclude(
+            author_id__in=authors
+        ).order_by('-pub_date', '-id').defer('text')
+    return MergedTimeline(**sources)
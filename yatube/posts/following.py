@@ -0,0 +1,63 @@
+"""Кого читает пользователь: кеш подписок для проверок «подписан ли я».
+
+Подписки пользователя лежат в кеше одним значением: множеством id
+авторов, а у читающих больше FOLLOWING_BLOOM_MIN авторов — фильтром
+Блума (None в настройке отключает фильтр). Ответ для всех авторов
+страницы даёт одно чтение кеша; при фильтре Блума «возможно подписан»
+подтверждается одним запросом на все такие id сразу. Подписка и отписка
+(posts.signals) сбрасывают значение.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.bloom import BloomFilter
+from core.cache import get_or_set
+
+from .models import Follow
+
+
+def following_cache_key(user_id):
+    return f'following:{user_id}'
+
+
+def following_index(user):
+    """Множество id авторов пользователя или фильтр Блума по ним."""
+    def build():
+        authors = frozenset(
+            Follow.objects.filter(user=user).values_list(
+                'author_id', flat=True
+            )
+        )
+        limit = settings.FOLLOWING_BLOOM_MIN
+        if limit is None or len(authors) <= limit:
+            return authors
+        return BloomFilter.from_items(
+            authors, settings.FOLLOWING_BLOOM_BITS_PER_ITEM
+        )
+
+    return get_or_set(
+        following_cache_key(user.pk), build, settings.FOLLOWING_TIMEOUT
+    )
+
+
+def following_among(user, author_ids):
+    """Те из author_ids, на кого подписан пользователь."""
+    if not user.is_authenticated:
+        return set()
+    index = following_index(user)
+    maybe = {pk for pk in author_ids if pk in index}
+    if maybe and isinstance(index, BloomFilter):
+        maybe = set(
+            Follow.objects.filter(
+                user=user, author_id__in=maybe
+            ).values_list('author_id', flat=True)
+        )
+    return maybe
+
+
+def is_following(user, author):
+    return author.pk in following_among(user, [author.pk])
+
+
+def forget(user_id):
+    cache.delete(following_cache_key(user_id))
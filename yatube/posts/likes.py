@@ -0,0 +1,141 @@
+"""Лайки постов.
+
+Счётчик лайков поста разбит на LIKE_SHARDS строк LikeShard: лайк
+пользователя меняет строку шарда user_id % LIKE_SHARDS, так что
+одновременные лайки одного поста не ждут одну и ту же строку. Сумма
+шардов кешируется на пост, а команда collapse_likes периодически
+переносит её в Post.likes (для сортировки и админки). Множество
+лайкнутых пользователем постов хранится в кеше целиком, поэтому отметка
+«вы лайкнули» для страницы — один запрос к кешу.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from core import metrics
+from core.cache import forget_user_pages, get_or_set
+
+from .models import Like, LikeShard, Post
+
+
+def likes_cache_key(post_id):
+    return f'likes:{post_id}'
+
+
+def liked_cache_key(user_id):
+    return f'liked:{user_id}'
+
+
+def shard_of(user_id):
+    return user_id % settings.LIKE_SHARDS
+
+
+def liked_ids(user):
+    """Множество id постов, которые лайкнул пользователь."""
+    if not user.is_authenticated:
+        return frozenset()
+
+    def build():
+        return frozenset(
+            user.likes.values_list('post_id', flat=True)
+        )
+
+    return get_or_set(
+        liked_cache_key(user.pk), build, settings.LIKE_SET_TIMEOUT
+    )
+
+
+def set_likes(user, post_ids, liked=True):
+    """Ставит (liked=True) или снимает лайки пользователя с постов.
+
+    Повторный вызов с тем же состоянием ничего не меняет. Отдаёт id
+    постов, у которых состояние действительно поменялось: шарды меняются
+    только на строки Like, которые этот вызов вставил или удалил, поэтому
+    одновременные одинаковые запросы не считаются дважды.
+    """
+    post_ids = set(post_ids)
+    changed = set()
+    with transaction.atomic():
+        existing = set(
+            user.likes.filter(post_id__in=post_ids).values_list(
+                'post_id', flat=True
+            )
+        )
+        if liked:
+            candidates = Post.objects.filter(
+                id__in=post_ids - existing
+            ).values_list('id', flat=True)
+            for pk in candidates:
+                try:
+                    with transaction.atomic():
+                        Like.objects.create(user=user, post_id=pk)
+                except IntegrityError:
+                    continue
+                changed.add(pk)
+            delta = 1
+        else:
+            for pk in existing:
+                deleted, _ = user.likes.filter(post_id=pk).delete()
+                if deleted:
+                    changed.add(pk)
+            delta = -1
+        if changed:
+            shard = shard_of(user.pk)
+            LikeShard.objects.bulk_create(
+                [LikeShard(post_id=pk, shard=shard) for pk in changed],
+                ignore_conflicts=True,
+            )
+            LikeShard.objects.filter(
+                post_id__in=changed, shard=shard
+            ).update(count=F('count') + delta)
+    if changed:
+        cache.delete(liked_cache_key(user.pk))
+        cache.delete_many([likes_cache_key(pk) for pk in changed])
+        # Страницы из cached_page хранят отметки лайков этого пользователя.
+        forget_user_pages(user.pk)
+        metrics.incr('likes.changed', len(changed))
+    return changed
+
+
+def like_counts(post_ids):
+    """{id поста: число лайков}: кеш, промахи — одним запросом к шардам."""
+    keys = {likes_cache_key(pk): pk for pk in post_ids}
+    counts = {
+        keys[key]: count for key, count in cache.get_many(list(keys)).items()
+    }
+    missing = [pk for pk in keys.values() if pk not in counts]
+    if missing:
+        loaded = dict.fromkeys(missing, 0)
+        loaded.update(
+            LikeShard.objects.filter(post_id__in=missing).values(
+                'post_id'
+            ).annotate(total=Sum('count')).values_list('post_id', 'total')
+        )
+        cache.set_many(
+            {likes_cache_key(pk): count for pk, count in loaded.items()},
+            settings.LIKE_COUNT_TIMEOUT,
+        )
+        counts.update(loaded)
+    return counts
+
+
+def attach_likes(posts, user):
+    """Проставляет постам like_count и is_liked для пользователя."""
+    counts = like_counts([post.id for post in posts])
+    liked = liked_ids(user)
+    for post in posts:
+        post.like_count = counts.get(post.id, 0)
+        post.is_liked = post.id in liked
+    return posts
+
+
+def collapse():
+    """Переносит суммы шардов в Post.likes, отдаёт число постов."""
+    total = LikeShard.objects.filter(post=OuterRef('pk')).values(
+        'post'
+    ).annotate(total=Sum('count')).values('total')
+    return Post.objects.filter(like_shards__isnull=False).distinct().update(
+        likes=Coalesce(Subquery(total), 0)
+    )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.likes import collapse
+
+
+class Command(BaseCommand):
+    help = ('Переносит суммы шардов счётчиков лайков в Post.likes. '
+            'Запускается периодически (cron).')
+
+    def handle(self, *args, **options):
+        updated = collapse()
+        self.stdout.write(f'Обновлено постов: {updated}')
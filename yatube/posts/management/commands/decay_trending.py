@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import decay
+
+
+class Command(BaseCommand):
+    help = ('Затухание оценок популярных постов. Запускается периодически '
+            '(cron) с интервалом TRENDING_DECAY_INTERVAL секунд.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=None,
+            help='Секунд с прошлого запуска, если интервал cron другой.',
+        )
+
+    def handle(self, *args, **options):
+        removed = decay(options['interval'])
+        self.stdout.write(f'Удалено угасших оценок: {removed}')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts import tags
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Разбирает хештеги всех постов: нужно один раз для постов, '
+            'опубликованных до появления тегов.')
+
+    def handle(self, *args, **options):
+        done = 0
+        for post in Post.objects.only('id', 'text', 'pub_date').iterator():
+            tags.sync(post)
+            done += 1
+        self.stdout.write(f'Обработано постов: {done}')
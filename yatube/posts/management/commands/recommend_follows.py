@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import rebuild
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рекомендации «кого почитать» по графу подписок. '
+            'Запускается периодически (cron).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=settings.RECOMMEND_LIMIT,
+            help='Сколько авторов рекомендовать каждому пользователю.',
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild(options['limit'])
+        self.stdout.write(f'Сохранено рекомендаций: {created}')
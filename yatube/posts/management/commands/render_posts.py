@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.rendering import backfill
+
+
+class Command(BaseCommand):
+    help = ('Заполняет HTML текста, анонс и число слов у постов, '
+            'сохранённых без них (например, через bulk_create).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать все посты, а не только незаполненные.',
+        )
+
+    def handle(self, *args, **options):
+        done = backfill(
+            Post, options['batch_size'], only_missing=not options['all']
+        )
+        self.stdout.write(f'Обработано постов: {done}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.notifications import send_digests
+
+
+class Command(BaseCommand):
+    help = ('Рассылает подписчикам дайджест новых постов за период '
+            'с предыдущей рассылки. Запускается периодически (cron).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        digest = send_digests(batch_size=options['batch_size'])
+        rate = digest.emails / digest.duration if digest.duration else 0
+        self.stdout.write(
+            f'Постов: {digest.posts}, писем: {digest.emails}, '
+            f'время: {digest.duration:.2f} с, {rate:.1f} писем/с'
+        )
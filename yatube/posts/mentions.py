@@ -0,0 +1,57 @@
+"""Упоминания @username в постах и комментариях.
+
+Имена пользователей разрешаются по словарю username → id в памяти
+процесса, который целиком перечитывается раз в MENTION_INDEX_TIMEOUT
+секунд. Имена, которых нет в словаре (например, новые пользователи),
+ищутся одним запросом на весь текст и добавляются в словарь.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from .rendering import parse_mentions
+
+User = get_user_model()
+
+
+class UsernameIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.ids = {}
+        self.loaded = None
+
+    def resolve(self, names):
+        """Отдаёт {username: id} для существующих пользователей из names."""
+        if not names:
+            return {}
+        with self.lock:
+            now = time.monotonic()
+            if (self.loaded is None
+                    or now - self.loaded > settings.MENTION_INDEX_TIMEOUT):
+                self.ids = dict(User.objects.values_list('username', 'id'))
+                self.loaded = now
+            found = {
+                name: self.ids[name] for name in names if name in self.ids
+            }
+            missing = set(names) - found.keys()
+            if missing:
+                loaded = dict(
+                    User.objects.filter(username__in=missing).values_list(
+                        'username', 'id'
+                    )
+                )
+                self.ids.update(loaded)
+                found.update(loaded)
+        return found
+
+
+index = UsernameIndex()
+
+
+def resolve_mentions(text):
+    return index.resolve(parse_mentions(text))
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_auto_20211002_2215'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDigest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_end', models.DateTimeField(db_index=True, verbose_name='Конец периода')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата рассылки')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('emails', models.PositiveIntegerField(default=0, verbose_name='Писем')),
+                ('duration', models.FloatField(default=0, verbose_name='Длительность, с')),
+            ],
+            options={
+                'verbose_name': 'Рассылка дайджеста',
+                'verbose_name_plural': 'Рассылки дайджестов',
+                'ordering': ('-period_end',),
+            },
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации'),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='slug',
+            field=models.SlugField(unique=True, verbose_name='Идентификатор группы'),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='title',
+            field=models.CharField(max_length=200, verbose_name='Название группы'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_summaries(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupSummary = apps.get_model('posts', 'GroupSummary')
+    GroupSummary.objects.bulk_create(
+        GroupSummary(
+            group_id=group.id,
+            posts_count=group.posts_count,
+            last_pub_date=group.last_pub_date,
+        )
+        for group in Group.objects.annotate(
+            posts_count=models.Count('posts'),
+            last_pub_date=models.Max('posts__pub_date'),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_auto_20261019_1011'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupSummary',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('last_pub_date', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'Сводка группы',
+                'verbose_name_plural': 'Сводки групп',
+                'ordering': ('-last_pub_date',),
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
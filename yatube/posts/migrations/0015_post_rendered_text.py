@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:33
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr, truncatewords_html
+
+# Копия правил на момент миграции: posts.rendering меняется (теги,
+# упоминания) и в истории миграций использоваться не должен.
+EXCERPT_WORDS = 70
+BATCH_SIZE = 500
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.order_by('id').only('id', 'text')
+    last_id = 0
+    while True:
+        batch = list(posts.filter(id__gt=last_id)[:BATCH_SIZE])
+        if not batch:
+            return
+        for post in batch:
+            post.text_html = linebreaksbr(post.text, autoescape=True)
+            post.excerpt = truncatewords_html(post.text_html, EXCERPT_WORDS)
+            post.word_count = len(post.text.split())
+        Post.objects.bulk_update(
+            batch, ('text_html', 'excerpt', 'word_count')
+        )
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_groupsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число слов'),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
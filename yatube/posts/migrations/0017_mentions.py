@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from posts.rendering import render_html
+
+
+def render_comments(apps, schema_editor):
+    Comment = apps.get_model('posts', 'Comment')
+    comments = list(Comment.objects.only('id', 'text'))
+    for comment in comments:
+        comment.text_html = render_html(comment.text)
+    Comment.objects.bulk_update(comments, ('text_html',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0016_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.CreateModel(
+            name='Mention',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата упоминания')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Прочитано')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор упоминания')),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='mentions', to='posts.Comment', verbose_name='Комментарий')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentions', to='posts.Post', verbose_name='Пост')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentions', to=settings.AUTH_USER_MODEL, verbose_name='Упомянутый пользователь')),
+            ],
+            options={
+                'verbose_name': 'Упоминание',
+                'verbose_name_plural': 'Упоминания',
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mention',
+            index=models.Index(fields=['user', '-created'], name='posts_menti_user_id_3db75e_idx'),
+        ),
+        migrations.RunPython(render_comments, migrations.RunPython.noop),
+    ]
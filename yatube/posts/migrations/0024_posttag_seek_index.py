@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0023_post_author_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='posttag',
+            name='posts_postt_tag_id_422b52_idx',
+        ),
+        migrations.AddIndex(
+            model_name='posttag',
+            index=models.Index(fields=['tag', '-pub_date', '-post'], name='posts_postt_tag_id_73b64f_idx'),
+        ),
+    ]
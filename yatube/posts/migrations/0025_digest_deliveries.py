@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0024_posttag_seek_index'),
+    ]
+
+    operations = [
+        # Прошлые рассылки уже завершены, новые создаются незавершёнными.
+        migrations.AddField(
+            model_name='notificationdigest',
+            name='is_finished',
+            field=models.BooleanField(default=True, verbose_name='Завершена'),
+        ),
+        migrations.AlterField(
+            model_name='notificationdigest',
+            name='is_finished',
+            field=models.BooleanField(default=False, verbose_name='Завершена'),
+        ),
+        migrations.CreateModel(
+            name='DigestDelivery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='posts.NotificationDigest', verbose_name='Рассылка')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Получатель')),
+            ],
+            options={
+                'verbose_name': 'Письмо дайджеста',
+                'verbose_name_plural': 'Письма дайджестов',
+                'unique_together': {('digest', 'user')},
+            },
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .mentions import resolve_mentions
+from .rendering import RENDERED_FIELDS, render_html, render_text
+
 User = get_user_model()
 
 
@@ -25,6 +28,30 @@ class Group(models.Model):
         return self.title
 
 
+class GroupSummary(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary',
+        verbose_name='Группа',
+    )
+    posts_count = models.PositiveIntegerField('Постов', default=0)
+    last_pub_date = models.DateTimeField(
+        'Последняя публикация',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        ordering = ('-last_pub_date',)
+        verbose_name = 'Сводка группы'
+        verbose_name_plural = 'Сводки групп'
+
+    def __str__(self):
+        return f'{self.group}: {self.posts_count}'
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
@@ -56,15 +83,140 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True,
     )
+    fanned_out = models.BooleanField(
+        'Разослан по лентам подписчиков',
+        default=False,
+    )
+    text_html = models.TextField(
+        'Текст в HTML',
+        blank=True,
+        editable=False,
+    )
+    excerpt = models.TextField(
+        'Анонс',
+        blank=True,
+        editable=False,
+    )
+    word_count = models.PositiveIntegerField(
+        'Число слов',
+        default=0,
+        editable=False,
+    )
+    views = models.PositiveIntegerField(
+        'Просмотры',
+        default=0,
+        editable=False,
+    )
+    likes = models.PositiveIntegerField(
+        'Лайки',
+        default=0,
+        editable=False,
+    )
+
+    UPDATE_ONLY_FIELDS = ('fanned_out', 'views', 'likes')
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=('author', 'fanned_out', '-pub_date')),
+            models.Index(fields=('group', '-pub_date')),
+            models.Index(fields=('author', '-pub_date')),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:15]
 
+    def render_text(self):
+        mentioned = resolve_mentions(self.text)
+        self._mentioned_ids = set(mentioned.values())
+        self.text_html, self.excerpt, self.word_count = render_text(
+            self.text, mentioned
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # Счётчики и флаги, которые меняются только запросами UPDATE,
+            # не перезаписываем значением, прочитанным до правки.
+            deferred = self.get_deferred_fields()
+            update_fields = kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.UPDATE_ONLY_FIELDS
+            ]
+        if update_fields is None or 'text' in update_fields:
+            self.render_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, *RENDERED_FIELDS
+                }
+        super().save(*args, **kwargs)
+
+
+class PostScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score',
+        verbose_name='Пост',
+    )
+    score = models.FloatField('Популярность', default=0, db_index=True)
+
+    class Meta:
+        ordering = ('-score',)
+        verbose_name = 'Популярность поста'
+        verbose_name_plural = 'Популярность постов'
+
+    def __str__(self):
+        return f'Пост {self.post_id}: {self.score:.2f}'
+
+
+class Like(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='likes',
+        verbose_name='Пользователь',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='like_set',
+        verbose_name='Пост',
+    )
+    created = models.DateTimeField('Дата лайка', auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'post')
+        verbose_name = 'Лайк'
+        verbose_name_plural = 'Лайки'
+
+    def __str__(self):
+        return f'{self.user_id} → пост {self.post_id}'
+
+
+class LikeShard(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='like_shards',
+        verbose_name='Пост',
+    )
+    shard = models.PositiveSmallIntegerField('Шард')
+    count = models.IntegerField('Лайков', default=0)
+
+    class Meta:
+        unique_together = ('post', 'shard')
+        verbose_name = 'Шард счётчика лайков'
+        verbose_name_plural = 'Шарды счётчиков лайков'
+
+    def __str__(self):
+        return f'Пост {self.post_id}, шард {self.shard}: {self.count}'
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -82,6 +234,11 @@ class Comment(models.Model):
     text = models.TextField(
         'Текст комментария',
     )
+    text_html = models.TextField(
+        'Текст в HTML',
+        blank=True,
+        editable=False,
+    )
     created = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации'
@@ -91,12 +248,58 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
+    def save(self, *args, **kwargs):
+        mentioned = resolve_mentions(self.text)
+        self._mentioned_ids = set(mentioned.values())
+        self.text_html = render_html(self.text, mentioned)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return (f'Текст: {self.text[:20]}'
                 f', Автор: {self.author.username}'
                 f', Дата и время написания: {self.created}')
 
 
+class Mention(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Упомянутый пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор упоминания',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Пост',
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        blank=True,
+        null=True,
+        verbose_name='Комментарий',
+    )
+    created = models.DateTimeField('Дата упоминания', auto_now_add=True)
+    is_read = models.BooleanField('Прочитано', default=False)
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = [models.Index(fields=('user', '-created'))]
+        verbose_name = 'Упоминание'
+        verbose_name_plural = 'Упоминания'
+
+    def __str__(self):
+        return f'@{self.user_id} в посте {self.post_id}'
+
+
 class Follow(models.Model):
     user = models.ForeignKey(
         User,
@@ -118,3 +321,183 @@ class Follow(models.Model):
     def __str__(self):
         return (f'Пользователь: {self.user.username}'
                 f', Автор: {self.author.username}')
+
+
+class GroupFollow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_follows',
+        verbose_name='Подписчик',
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Группа',
+    )
+
+    class Meta:
+        unique_together = ('user', 'group')
+        verbose_name = 'Подписка на группу'
+        verbose_name_plural = 'Подписки на группы'
+
+    def __str__(self):
+        return f'Пользователь: {self.user_id}, Группа: {self.group_id}'
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='Пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Рекомендуемый автор',
+    )
+    score = models.PositiveIntegerField('Общих подписок', default=0)
+
+    class Meta:
+        ordering = ('-score',)
+        unique_together = ('user', 'author')
+        indexes = [models.Index(fields=('user', '-score'))]
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+    def __str__(self):
+        return f'{self.user_id} → {self.author_id}: {self.score}'
+
+
+class FeedEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Подписчик',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Пост',
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        ordering = ('-pub_date',)
+        unique_together = ('user', 'post')
+        indexes = [models.Index(fields=('user', '-pub_date'))]
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи лент'
+
+    def __str__(self):
+        return f'Лента {self.user_id}: пост {self.post_id}'
+
+
+class Tag(models.Model):
+    name = models.CharField('Тег', max_length=50, unique=True)
+    posts_count = models.PositiveIntegerField('Постов', default=0)
+
+    class Meta:
+        ordering = ('name',)
+        verbose_name = 'Тег'
+        verbose_name_plural = 'Теги'
+
+    def __str__(self):
+        return f'#{self.name}'
+
+
+class PostTag(models.Model):
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='entries',
+        verbose_name='Тег',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='tag_entries',
+        verbose_name='Пост',
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        ordering = ('-pub_date',)
+        unique_together = ('tag', 'post')
+        indexes = [models.Index(fields=('tag', '-pub_date', '-post'))]
+        verbose_name = 'Тег поста'
+        verbose_name_plural = 'Теги постов'
+
+    def __str__(self):
+        return f'{self.tag}: пост {self.post_id}'
+
+
+class TagActivity(models.Model):
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='activity',
+        verbose_name='Тег',
+    )
+    hour = models.DateTimeField('Час', db_index=True)
+    posts = models.PositiveIntegerField('Постов', default=0)
+
+    class Meta:
+        ordering = ('-hour',)
+        unique_together = ('tag', 'hour')
+        verbose_name = 'Активность тега'
+        verbose_name_plural = 'Активность тегов'
+
+    def __str__(self):
+        return f'{self.tag} {self.hour}: {self.posts}'
+
+
+class NotificationDigest(models.Model):
+    period_end = models.DateTimeField(
+        'Конец периода',
+        db_index=True,
+    )
+    created = models.DateTimeField(
+        'Дата рассылки',
+        auto_now_add=True,
+    )
+    posts = models.PositiveIntegerField('Постов', default=0)
+    emails = models.PositiveIntegerField('Писем', default=0)
+    duration = models.FloatField('Длительность, с', default=0)
+    is_finished = models.BooleanField('Завершена', default=False)
+
+    class Meta:
+        ordering = ('-period_end',)
+        verbose_name = 'Рассылка дайджеста'
+        verbose_name_plural = 'Рассылки дайджестов'
+
+    def __str__(self):
+        return f'Дайджест до {self.period_end}: писем {self.emails}'
+
+
+class DigestDelivery(models.Model):
+    digest = models.ForeignKey(
+        NotificationDigest,
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+        verbose_name='Рассылка',
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Получатель',
+    )
+
+    class Meta:
+        unique_together = ('digest', 'user')
+        verbose_name = 'Письмо дайджеста'
+        verbose_name_plural = 'Письма дайджестов'
+
+    def __str__(self):
+        return f'Дайджест {self.digest_id} для {self.user_id}'
@@ -0,0 +1,171 @@
+"""Дайджесты «новые посты авторов, на которых вы подписаны».
+
+Очередью событий служит сама таблица постов: каждая рассылка забирает
+посты, опубликованные после конца предыдущего периода, и собирает их в
+одно письмо на подписчика. Письма уходят пачками через одно соединение.
+Период заканчивается на DIGEST_SAFETY_LAG секунд раньше запуска, чтобы
+не пропустить посты из ещё не завершённых транзакций. Получатель пачки
+записывается (DigestDelivery) в одной транзакции с отправкой, поэтому
+прерванная рассылка при следующем запуске продолжается с тех, кому
+письмо ещё не ушло.
+
+Уведомления об упоминаниях (@username) создаются одним INSERT на пост
+или комментарий.
+"""
+import itertools
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import mail
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core import metrics
+
+from .models import (DigestDelivery, Follow, Mention, NotificationDigest,
+                     Post, User)
+
+
+def last_period_end(before=None):
+    digests = NotificationDigest.objects.only('period_end')
+    if before is not None:
+        digests = digests.filter(period_end__lt=before)
+    digest = digests.first()
+    if digest is None:
+        return timezone.now() - timedelta(seconds=settings.DIGEST_FIRST_PERIOD)
+    return digest.period_end
+
+
+def open_digest(until):
+    """Незавершённая рассылка (её и продолжаем) или новая до until."""
+    digest = NotificationDigest.objects.filter(is_finished=False).first()
+    if digest is None:
+        digest = NotificationDigest.objects.create(period_end=until)
+    return digest
+
+
+def new_posts_by_author(since, until):
+    posts_by_author = {}
+    posts = Post.objects.filter(
+        pub_date__gt=since, pub_date__lte=until
+    ).select_related('author').order_by('pub_date')
+    for post in posts:
+        posts_by_author.setdefault(post.author_id, []).append(post)
+    return posts_by_author
+
+
+def collect_digests(posts_by_author):
+    """Отдаёт (user_id, username, email, posts) по одному на подписчика."""
+    if not posts_by_author:
+        return
+    follows = Follow.objects.filter(
+        author_id__in=posts_by_author
+    ).exclude(user__email='').order_by('user_id').values_list(
+        'user_id', 'user__username', 'user__email', 'author_id'
+    ).iterator()
+    for (user_id, username, email), rows in itertools.groupby(
+        follows, key=lambda row: row[:3]
+    ):
+        recipient_posts = sorted(
+            itertools.chain.from_iterable(
+                posts_by_author[row[3]] for row in rows
+            ),
+            key=lambda post: post.pub_date,
+        )
+        yield user_id, username, email, recipient_posts
+
+
+def build_message(username, email, posts, connection):
+    return mail.EmailMessage(
+        subject=f'Yatube: новые записи ({len(posts)})',
+        body=render_to_string('posts/email/digest.txt', {
+            'username': username,
+            'posts': posts,
+            'site_url': settings.SITE_URL,
+        }),
+        to=[email],
+        connection=connection,
+    )
+
+
+def claim_recipients(digest, batch):
+    """Записывает получателей пачки, отдаёт тех, кому письма ещё не было."""
+    claimed = []
+    for item in batch:
+        try:
+            with transaction.atomic():
+                DigestDelivery.objects.create(digest=digest, user_id=item[0])
+        except IntegrityError:
+            continue
+        claimed.append(item)
+    return claimed
+
+
+def send_digests(until=None, batch_size=None):
+    """Рассылает дайджесты за период с прошлой рассылки до until."""
+    start = time.perf_counter()
+    until = until or timezone.now() - timedelta(
+        seconds=settings.DIGEST_SAFETY_LAG
+    )
+    batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+    digest = open_digest(until)
+    posts_by_author = new_posts_by_author(
+        last_period_end(before=digest.period_end), digest.period_end
+    )
+    digests = collect_digests(posts_by_author)
+    emails = 0
+    connection = mail.get_connection()
+    connection.open()
+    try:
+        while True:
+            batch = list(itertools.islice(digests, batch_size))
+            if not batch:
+                break
+            # Ошибка отправки откатывает и записи о получателях пачки.
+            with transaction.atomic():
+                batch = claim_recipients(digest, batch)
+                if batch:
+                    emails += connection.send_messages([
+                        build_message(username, email, posts, connection)
+                        for _, username, email, posts in batch
+                    ]) or 0
+            metrics.incr('digest.batches')
+    finally:
+        connection.close()
+    duration = time.perf_counter() - start
+    metrics.incr('digest.emails', emails)
+    metrics.incr('digest.seconds', duration)
+    NotificationDigest.objects.filter(id=digest.id).update(
+        posts=sum(len(posts) for posts in posts_by_author.values()),
+        emails=digest.deliveries.count(),
+        duration=F('duration') + duration,
+        is_finished=True,
+    )
+    digest.refresh_from_db()
+    return digest
+
+
+def notify_mentions(author_id, user_ids, post_id, comment_id=None):
+    """Уведомляет упомянутых пользователей, кроме автора и уже уведомлённых
+    о том же посте."""
+    user_ids = set(user_ids) - {author_id}
+    if user_ids:
+        # Словарь имён (posts.mentions) может помнить удалённых пользователей.
+        user_ids = set(User.objects.filter(id__in=user_ids).values_list(
+            'id', flat=True
+        ))
+    if user_ids and comment_id is None:
+        user_ids -= set(Mention.objects.filter(
+            post_id=post_id, comment=None, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+    Mention.objects.bulk_create(
+        Mention(
+            user_id=user_id, author_id=author_id,
+            post_id=post_id, comment_id=comment_id,
+        )
+        for user_id in user_ids
+    )
+    metrics.incr('mentions.created', len(user_ids))
@@ -0,0 +1,139 @@
+"""Постраничный вывод с окном ссылок и разреженным индексом переходов.
+
+Для длинных списков (главная, группа, автор) в кеше хранится каждая
+PAGINATION_SEEK_STEP-я пара (pub_date, id). Страница N читается
+keyset-запросом от ближайшей предшествующей метки, так что OFFSET не
+превышает шага индекса. Новые посты попадают в начало списка, поэтому
+индекс не перестраивается при публикации: метки сдвигаются на разницу
+между текущим числом постов и числом при построении. Удаление поста
+сбрасывает индексы его списков (posts.signals).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+from .timelines import hydrate
+
+
+def seek_cache_key(seek_key):
+    return f'seek:{seek_key}'
+
+
+def build_markers(queryset, step, id_field='id'):
+    """Отдаёт (число строк, каждая step-я пара (pub_date, id))."""
+    markers = []
+    total = 0
+    for row in queryset.values_list('pub_date', id_field).iterator():
+        if total % step == 0:
+            markers.append(row)
+        total += 1
+    return total, markers
+
+
+def older_than(queryset, pub_date, pk):
+    """Записи после (pub_date, pk) в порядке по убыванию (pub_date, id)."""
+    return queryset.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+    )
+
+
+def invalidate(*seek_keys):
+    cache.delete_many([seek_cache_key(key) for key in seek_keys])
+
+
+class SeekPaginator(Paginator):
+    """Paginator с окном номеров страниц и переходом по разреженному индексу.
+
+    Без seek_key ведёт себя как обычный Paginator (например, для ленты
+    подписок, которая не является queryset). Если задан head — начало
+    списка из кеша (posts.timelines), страницы в его пределах собираются
+    из кеша постов без запроса к списку.
+
+    id_field — поле с id поста, если список состоит не из постов, а из
+    записей-указателей с копией pub_date (например, PostTag): сортировка
+    и метки индекса берутся из столбцов этой таблицы, а посты страницы
+    достаются по id через hydrate.
+    """
+
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, seek_key=None, id_field='id',
+                 **kwargs):
+        if seek_key is not None:
+            object_list = object_list.order_by('-pub_date', f'-{id_field}')
+        super().__init__(object_list, per_page, **kwargs)
+        self.seek_key = seek_key
+        self.id_field = id_field
+        self.head = None
+        self.window = []
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        return self.restore(number, self.slice(bottom, top))
+
+    def restore(self, number, object_list):
+        """Собирает страницу из уже выбранных записей (например, из кеша)."""
+        self.window = list(self.get_elided_page_range(number))
+        return self._get_page(object_list, number, self)
+
+    def slice(self, bottom, top):
+        if self.head is not None and top <= len(self.head):
+            return hydrate([pk for pk, _ in self.head[bottom:top]])
+        step = settings.PAGINATION_SEEK_STEP
+        if self.seek_key is None or bottom < step:
+            return self.select(self.object_list, bottom, top)
+        built_count, markers = self.seek_index(step)
+        position = min((bottom - self.count + built_count) // step,
+                       len(markers) - 1)
+        if position < 0:
+            return self.select(self.object_list, bottom, top)
+        offset = position * step + self.count - built_count
+        pub_date, pk = markers[position]
+        return self.select(
+            self.object_list.filter(
+                Q(pub_date__lt=pub_date)
+                | Q(pub_date=pub_date, **{f'{self.id_field}__lte': pk})
+            ),
+            bottom - offset, top - offset,
+        )
+
+    def select(self, queryset, bottom, top):
+        if self.id_field == 'id':
+            return queryset[bottom:top]
+        return hydrate(list(
+            queryset.values_list(self.id_field, flat=True)[bottom:top]
+        ))
+
+    def seek_index(self, step):
+        key = seek_cache_key(self.seek_key)
+        index = cache.get(key)
+        if index is None or index[0] > self.count:
+            index = build_markers(self.object_list, step, self.id_field)
+            cache.set(key, index, settings.PAGINATION_SEEK_TIMEOUT)
+        return index
+
+    def get_elided_page_range(self, number=1, on_each_side=2, on_ends=1):
+        """Номера страниц вокруг текущей и по краям, пропуски — ELLIPSIS."""
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(
+                self.num_pages - on_ends + 1, self.num_pages + 1
+            )
+        else:
+            yield from range(number + 1, self.num_pages + 1)
@@ -0,0 +1,86 @@
+"""Подготовка текста поста к показу.
+
+Результат считается один раз при сохранении поста (Post.save) и
+хранится в полях text_html, excerpt и word_count, поэтому списки постов
+не читают и не обрабатывают полный текст. Функции не зависят от моделей:
+backfill получает модель постов и считает поля её методом render_text.
+"""
+import re
+
+from django.template.defaultfilters import linebreaksbr, truncatewords_html
+from django.urls import reverse
+
+EXCERPT_WORDS = 70
+
+# После экранирования «'» превращается в &#39; — это не тег.
+TAG_RE = re.compile(r'(?<![&\w])#(\w{1,50})')
+
+# Адреса почты (a@b.ru) не считаются упоминаниями.
+MENTION_RE = re.compile(r'(?<![\w.+-])@([\w.@+-]{1,150})')
+
+RENDERED_FIELDS = ('text_html', 'excerpt', 'word_count')
+
+
+def parse_tags(text):
+    return {name.lower() for name in TAG_RE.findall(text)}
+
+
+def parse_mentions(text):
+    return {name.rstrip('.') for name in MENTION_RE.findall(text)} - {''}
+
+
+def link_tag(match):
+    url = reverse('posts:tag_posts', args=[match.group(1).lower()])
+    return f'<a href="{url}">{match.group(0)}</a>'
+
+
+def link_mentions(text_html, mentions):
+    def link(match):
+        name = match.group(1).rstrip('.')
+        if name not in mentions:
+            return match.group(0)
+        url = reverse('posts:profile', args=[name])
+        return f'<a href="{url}">@{name}</a>' + match.group(1)[len(name):]
+
+    return MENTION_RE.sub(link, text_html)
+
+
+def render_html(text, mentions=()):
+    """HTML текста: переносы строк, ссылки на теги и на упомянутых
+    пользователей (только из mentions — уже проверенных имён)."""
+    text_html = TAG_RE.sub(link_tag, linebreaksbr(text, autoescape=True))
+    if mentions:
+        text_html = link_mentions(text_html, mentions)
+    return text_html
+
+
+def render_text(text, mentions=()):
+    """Отдаёт (HTML текста, HTML анонса, число слов)."""
+    text_html = render_html(text, mentions)
+    return (
+        text_html,
+        truncatewords_html(text_html, EXCERPT_WORDS),
+        len(text.split()),
+    )
+
+
+def backfill(model, batch_size=500, only_missing=True):
+    """Пересчитывает поля текста у постов пачками, возвращает их число.
+
+    Поля считает model.render_text — как при сохранении поста, вместе со
+    ссылками на упомянутых пользователей.
+    """
+    posts = model.objects.order_by('id').only('id', 'text')
+    if only_missing:
+        posts = posts.filter(text_html='')
+    done = 0
+    last_id = 0
+    while True:
+        batch = list(posts.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return done
+        for post in batch:
+            post.render_text()
+        model.objects.bulk_update(batch, RENDERED_FIELDS)
+        done += len(batch)
+        last_id = batch[-1].id
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from core.cache import bump
+
+from . import (archive, events, feeds, following, notifications, pagination,
+               recommendations, summaries, tags, timelines, trending)
+from .models import Comment, Follow, Group, GroupSummary, Post
+from .tasks import backfill_feed
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        # После коммита подписки: см. posts.feeds.fan_out.
+        backfill_feed.delay(instance.user_id, instance.author_id)
+        trending.record_follow(instance.author_id)
+        recommendations.forget(instance.user_id, instance.author_id)
+        following.forget(instance.user_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    feeds.drop(instance.user_id, instance.author_id)
+    following.forget(instance.user_id)
+
+
+NOT_LOADED = object()
+
+
+@receiver(post_init, sender=Post)
+def remember_group(sender, instance, **kwargs):
+    # Отложенное поле не читаем, чтобы не делать запрос на каждый пост.
+    instance._saved_group_id = instance.__dict__.get('group_id', NOT_LOADED)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Ленты хранят только id, правка текста сбрасывает лишь кеш поста.
+    timelines.forget_post(instance.id)
+    if not created and archive.is_historical(instance.pub_date):
+        bump('history')
+    if update_fields is None or 'text' in update_fields:
+        tags.sync(instance)
+        notifications.notify_mentions(
+            instance.author_id, instance._mentioned_ids, instance.id
+        )
+    if created:
+        summaries.post_added(instance.group_id, instance.pub_date)
+        forget_lists(
+            f'author:{instance.author_id}', f'group:{instance.group_id}'
+        )
+        events.publish_post(instance)
+    elif instance._saved_group_id is NOT_LOADED:
+        return
+    elif instance._saved_group_id != instance.group_id:
+        summaries.post_removed(instance._saved_group_id, instance.pub_date)
+        summaries.post_added(instance.group_id, instance.pub_date)
+        lists = (
+            f'group:{instance._saved_group_id}', f'group:{instance.group_id}'
+        )
+        pagination.invalidate(*lists)
+        forget_lists(*lists)
+    instance._saved_group_id = instance.group_id
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    tags.post_removed(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    timelines.forget_post(instance.id)
+    if archive.is_historical(instance.pub_date):
+        bump('history')
+    lists = ['index', f'author:{instance.author_id}']
+    if instance._saved_group_id is not NOT_LOADED:
+        summaries.post_removed(instance._saved_group_id, instance.pub_date)
+        lists.append(f'group:{instance._saved_group_id}')
+    pagination.invalidate(*lists)
+    forget_lists(*lists[1:])
+
+
+def forget_lists(*lists):
+    """Сбрасывает кешированные ленты списков (posts.timelines)."""
+    for name in lists:
+        bump(name)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        notifications.notify_mentions(
+            instance.author_id, instance._mentioned_ids,
+            instance.post_id, instance.id,
+        )
+        trending.record(instance.post_id, settings.TRENDING_COMMENT_WEIGHT)
+        events.publish_comment(instance)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    if created:
+        GroupSummary.objects.get_or_create(group=instance)
+    else:
+        # Название и адрес группы есть в карточках архивных страниц.
+        bump('history')
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    # Посты группы теряют её через UPDATE, без сигналов Post.
+    bump('history')
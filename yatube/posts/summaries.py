@@ -0,0 +1,51 @@
+"""Сводки групп: число постов и дата последней публикации.
+
+Обновляются сигналами при сохранении и удалении постов, поэтому
+страницы групп не выполняют агрегирующих запросов при чтении.
+"""
+from django.db.models import Count, F, Max, Q
+
+from .models import GroupSummary, Post
+
+
+def rebuild(group_id):
+    stats = Post.objects.filter(group_id=group_id).aggregate(
+        posts_count=Count('id'), last_pub_date=Max('pub_date')
+    )
+    summary, _ = GroupSummary.objects.update_or_create(
+        group_id=group_id, defaults=stats
+    )
+    return summary
+
+
+def post_added(group_id, pub_date):
+    if group_id is None:
+        return
+    summaries = GroupSummary.objects.filter(group_id=group_id)
+    if not summaries.update(posts_count=F('posts_count') + 1):
+        rebuild(group_id)
+        return
+    summaries.filter(
+        Q(last_pub_date__lt=pub_date) | Q(last_pub_date__isnull=True)
+    ).update(last_pub_date=pub_date)
+
+
+def post_removed(group_id, pub_date):
+    if group_id is None:
+        return
+    summaries = GroupSummary.objects.filter(group_id=group_id)
+    if not summaries.filter(posts_count__gt=0).update(
+        posts_count=F('posts_count') - 1
+    ):
+        rebuild(group_id)
+        return
+    if summaries.filter(last_pub_date=pub_date).exists():
+        # Удалён последний пост группы — дату нужно пересчитать.
+        rebuild(group_id)
+
+
+def get_summary(group):
+    try:
+        return group.summary
+    except GroupSummary.DoesNotExist:
+        return rebuild(group.id)
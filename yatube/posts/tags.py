@@ -0,0 +1,113 @@
+"""Хештеги постов.
+
+Теги разбираются из текста при сохранении поста (posts.signals) в
+таблицу PostTag с индексом (tag, -pub_date, -post), по которому
+читаются и листаются ленты тегов: сами посты достаются по id. Число
+постов тега и почасовые счётчики для популярных тегов меняются на месте
+при добавлении и удалении тегов поста, текст постов при чтении не
+просматривается.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from core.cache import bump, get_or_set
+
+from . import pagination
+from .models import PostTag, Tag, TagActivity
+from .rendering import parse_tags
+
+
+def hour_of(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def sync(post):
+    """Приводит теги поста в соответствие с его текстом."""
+    names = parse_tags(post.text)
+    current = dict(
+        PostTag.objects.filter(post=post).values_list('tag__name', 'tag_id')
+    )
+    with transaction.atomic():
+        removed = [current[name] for name in current.keys() - names]
+        if removed:
+            remove(post, removed)
+        added = names - current.keys()
+        if added:
+            add(post, added)
+
+
+def add(post, names):
+    Tag.objects.bulk_create(
+        (Tag(name=name) for name in names), ignore_conflicts=True
+    )
+    tag_ids = list(
+        Tag.objects.filter(name__in=names).values_list('id', flat=True)
+    )
+    PostTag.objects.bulk_create(
+        PostTag(tag_id=tag_id, post=post, pub_date=post.pub_date)
+        for tag_id in tag_ids
+    )
+    Tag.objects.filter(id__in=tag_ids).update(
+        posts_count=F('posts_count') + 1
+    )
+    hour = hour_of(post.pub_date)
+    TagActivity.objects.bulk_create(
+        (TagActivity(tag_id=tag_id, hour=hour) for tag_id in tag_ids),
+        ignore_conflicts=True,
+    )
+    TagActivity.objects.filter(tag_id__in=tag_ids, hour=hour).update(
+        posts=F('posts') + 1
+    )
+    # Индекс переходов считает, что новые записи встают в начало списка;
+    # тег, добавленный правкой старого поста, попадает в его середину.
+    shifted = set(PostTag.objects.filter(
+        tag_id__in=tag_ids, pub_date__gt=post.pub_date
+    ).values_list('tag_id', flat=True))
+    pagination.invalidate(*(f'tag:{tag_id}' for tag_id in shifted))
+    for tag_id in tag_ids:
+        bump(f'tag:{tag_id}')
+
+
+def remove(post, tag_ids):
+    PostTag.objects.filter(post=post, tag_id__in=tag_ids).delete()
+    Tag.objects.filter(id__in=tag_ids, posts_count__gt=0).update(
+        posts_count=F('posts_count') - 1
+    )
+    TagActivity.objects.filter(
+        tag_id__in=tag_ids, hour=hour_of(post.pub_date), posts__gt=0
+    ).update(posts=F('posts') - 1)
+    lists = [f'tag:{tag_id}' for tag_id in tag_ids]
+    pagination.invalidate(*lists)
+    for name in lists:
+        bump(name)
+
+
+def post_removed(post):
+    tag_ids = list(post.tag_entries.values_list('tag_id', flat=True))
+    if tag_ids:
+        remove(post, tag_ids)
+
+
+def trending(limit=None):
+    """Самые частые теги за последние TRENDING_TAGS_HOURS часов."""
+    limit = limit or settings.TRENDING_TAGS_LIMIT
+
+    def build():
+        since = timezone.now() - timedelta(
+            hours=settings.TRENDING_TAGS_HOURS
+        )
+        return list(
+            TagActivity.objects.filter(hour__gte=hour_of(since))
+            .values('tag__name')
+            .annotate(posts_count=Sum('posts'))
+            .filter(posts_count__gt=0)
+            .order_by('-posts_count', 'tag__name')[:limit]
+        )
+
+    return get_or_set(
+        f'trending_tags:{limit}', build, settings.TRENDING_TAGS_TIMEOUT
+    )
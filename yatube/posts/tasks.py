@@ -0,0 +1,38 @@
+from django.conf import settings
+from sorl.thumbnail import get_thumbnail
+
+from core.tasks import task
+
+from . import feeds
+from .models import Post
+
+THUMBNAIL_GEOMETRY = '960x339'
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+@task()
+def warm_thumbnail(post_id):
+    post = Post.objects.filter(id=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    get_thumbnail(post.image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
+
+
+@task()
+def fan_out_post(post_id):
+    post = Post.objects.filter(id=post_id, fanned_out=False).first()
+    if post is not None:
+        feeds.fan_out(post)
+
+
+@task()
+def backfill_feed(user_id, author_id):
+    feeds.backfill(user_id, author_id)
+
+
+def schedule_post_side_effects(post):
+    """Ставит в очередь побочные эффекты создания/правки поста."""
+    if not post.fanned_out and settings.FEED_MODE == 'hybrid':
+        fan_out_post.delay(post.id, key=f'fanout:{post.id}')
+    if post.image:
+        warm_thumbnail.delay(post.id, key=f'thumbnail:{post.image.name}')
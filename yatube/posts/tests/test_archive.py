@@ -0,0 +1,159 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.cache import bump
+
+from ..models import Group, Post, User
+from ..utils import encode_cursor
+
+OLD_DATE = timezone.make_aware(datetime(2020, 3, 15, 12))
+ARCHIVE_URL = reverse('posts:archive', kwargs={'year': 2020, 'month': 3})
+GROUP_ARCHIVE_URL = reverse(
+    'posts:group_archive', kwargs={'slug': 'group', 'year': 2020, 'month': 3}
+)
+PROFILE_ARCHIVE_URL = reverse(
+    'posts:profile_archive',
+    kwargs={'username': 'author', 'year': 2020, 'month': 3},
+)
+PROFILE_FRAGMENT_URL = reverse(
+    'posts:profile_fragment', kwargs={'username': 'author'}
+)
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.other = User.objects.create(username='other')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.old_post = Post.objects.create(
+            text='Старый пост', author=cls.author, group=cls.group
+        )
+        cls.old_other = Post.objects.create(
+            text='Старый пост другого', author=cls.other
+        )
+        Post.objects.filter(
+            id__in=[cls.old_post.id, cls.old_other.id]
+        ).update(pub_date=OLD_DATE)
+        cls.old_post.refresh_from_db()
+        cls.new_post = Post.objects.create(
+            text='Новый пост', author=cls.author
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_archives_list_posts_of_month(self):
+        cases = {
+            ARCHIVE_URL: [self.old_other, self.old_post],
+            GROUP_ARCHIVE_URL: [self.old_post],
+            PROFILE_ARCHIVE_URL: [self.old_post],
+        }
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(
+                    list(response.context['page_obj']), expected
+                )
+
+    def test_closed_month_is_immutable_until_old_post_edited(self):
+        response = self.guest_client.get(ARCHIVE_URL)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+        Post.objects.filter(id=self.old_post.id).update(text='Тихая правка')
+        self.assertNotContains(
+            self.guest_client.get(ARCHIVE_URL), 'Тихая правка'
+        )
+        self.old_post.text = 'Правка'
+        self.old_post.save()
+        self.assertContains(self.guest_client.get(ARCHIVE_URL), 'Правка')
+
+    def test_immutable_page_has_no_counters(self):
+        self.assertNotContains(
+            self.guest_client.get(ARCHIVE_URL), 'Просмотров'
+        )
+        now = timezone.localtime()
+        self.assertContains(
+            self.guest_client.get(reverse(
+                'posts:archive',
+                kwargs={'year': now.year, 'month': now.month},
+            )),
+            'Просмотров',
+        )
+
+    @override_settings(TIME_ZONE='Asia/Vladivostok')
+    def test_archive_link_uses_local_month(self):
+        Post.objects.filter(id=self.old_post.id).update(
+            pub_date=timezone.make_aware(
+                datetime(2020, 3, 31, 20), timezone.utc
+            )
+        )
+        april_url = reverse(
+            'posts:archive', kwargs={'year': 2020, 'month': 4}
+        )
+        response = self.guest_client.get(april_url)
+        self.assertEqual(list(response.context['page_obj']), [self.old_post])
+        self.assertContains(response, f'href="{april_url}"')
+
+    def test_group_changes_refresh_immutable_pages(self):
+        group = Group.objects.create(title='Старая', slug='old')
+        Post.objects.filter(id=self.old_other.id).update(group=group)
+        bump('history')
+        self.assertContains(self.guest_client.get(ARCHIVE_URL), '/group/old/')
+        group.title = 'Новая'
+        group.slug = 'new'
+        group.save()
+        response = self.guest_client.get(ARCHIVE_URL)
+        self.assertContains(response, 'Новая')
+        self.assertNotContains(response, '/group/old/')
+        group.delete()
+        self.assertNotContains(self.guest_client.get(ARCHIVE_URL), 'Новая')
+
+    def test_current_month_and_users_are_not_immutable(self):
+        now = timezone.localtime()
+        current_url = reverse(
+            'posts:archive', kwargs={'year': now.year, 'month': now.month}
+        )
+        response = self.guest_client.get(current_url)
+        self.assertEqual(list(response.context['page_obj']), [self.new_post])
+        self.assertNotIn('immutable', response['Cache-Control'])
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(ARCHIVE_URL)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_old_cursor_fragment_is_immutable(self):
+        old_cursor = encode_cursor(self.old_post)
+        response = self.guest_client.get(
+            f'{PROFILE_FRAGMENT_URL}?cursor={old_cursor}'
+        )
+        self.assertIn('immutable', response['Cache-Control'])
+        new_cursor = encode_cursor(self.new_post)
+        response = self.guest_client.get(
+            f'{PROFILE_FRAGMENT_URL}?cursor={new_cursor}'
+        )
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_out_of_range_cursor_is_not_closed_period(self):
+        urls = (
+            reverse('posts:index_fragment'),
+            reverse('posts:group_fragment', kwargs={'slug': 'group'}),
+            PROFILE_FRAGMENT_URL,
+        )
+        for url in urls:
+            for cursor in ('99999999999999999999.1', '-99999999999999999.1'):
+                with self.subTest(url=url, cursor=cursor):
+                    response = self.guest_client.get(f'{url}?cursor={cursor}')
+                    self.assertEqual(response.status_code, 404)
+
+    def test_wrong_month_not_found(self):
+        response = self.guest_client.get(
+            reverse('posts:archive', kwargs={'year': 2020, 'month': 13})
+        )
+        self.assertEqual(response.status_code, 404)
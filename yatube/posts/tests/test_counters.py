@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import ViewBuffer, attach_views, buffer
+from ..models import Post, PostScore, User
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='author')
+
+    def setUp(self):
+        cache.clear()
+        buffer.take()
+        self.guest_client = Client()
+        self.post = Post.objects.create(text='Пост', author=self.user)
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}
+        )
+
+    def tearDown(self):
+        buffer.take()
+
+    def views(self):
+        return Post.objects.values_list('views', flat=True).get(
+            id=self.post.id
+        )
+
+    def test_views_are_buffered_until_flush(self):
+        for _ in range(3):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['post'].view_count, 3)
+        self.assertEqual(self.views(), 0)
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(self.views(), 3)
+        self.assertTrue(PostScore.objects.filter(post=self.post).exists())
+        self.assertEqual(attach_views([self.post])[0].view_count, 3)
+
+    @override_settings(VIEW_FLUSH_SIZE=1)
+    def test_flush_when_buffer_is_full(self):
+        self.guest_client.get(self.url)
+        self.assertEqual(self.views(), 1)
+
+    def test_edit_does_not_overwrite_flushed_views(self):
+        post = Post.objects.get(id=self.post.id)
+        buffer.add(self.post.id)
+        buffer.flush()
+        post.text = 'Правка'
+        post.save()
+        self.assertEqual(self.views(), 1)
+
+    def test_flush_skips_deleted_posts(self):
+        buffer.add(self.post.id)
+        self.post.delete()
+        self.assertEqual(buffer.flush(), 1)
+        self.assertFalse(PostScore.objects.exists())
+
+    @override_settings(VIEW_FLUSH_SIZE=1)
+    def test_failed_flush_keeps_views_and_page_works(self):
+        with mock.patch.object(
+            ViewBuffer, 'write', side_effect=DatabaseError('locked')
+        ), self.assertLogs('posts.counters', 'ERROR'):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.views(), 0)
+        self.assertEqual(buffer.get(self.post.id), 1)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(self.views(), 1)
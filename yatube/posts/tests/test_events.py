@@ -0,0 +1,92 @@
+import asyncio
+
+from django.conf import settings
+from django.test import Client, TestCase
+
+from core.asgi import ASGIHandler
+from core.pubsub import hub
+
+from ..events import stream, subscriptions
+from ..models import Follow, Group, GroupFollow, User
+
+
+def run_stream(query, *events):
+    """Подключается к потоку, публикует events из другого потока и
+    отключается; отдаёт отправленные клиенту сообщения."""
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': settings.SSE_PATH,
+        'query_string': query, 'headers': [],
+    }
+    messages = []
+    handler = ASGIHandler(None, max_workers=1)
+
+    async def main():
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+
+        task = asyncio.ensure_future(
+            stream(scope, receive, send, handler.run_sync)
+        )
+        while not hub.channels and not task.done():
+            await asyncio.sleep(0.01)
+        loop = asyncio.get_running_loop()
+        for channel, event in events:
+            await loop.run_in_executor(None, hub.publish, channel, event)
+        await asyncio.sleep(0.05)
+        disconnected.set()
+        await task
+
+    asyncio.run(main())
+    handler.executor.shutdown()
+    return messages
+
+
+class EventStreamTests(TestCase):
+    def test_comments_and_new_posts_are_pushed(self):
+        comment = b'event: comment\ndata: {}\n\n'
+        start, *bodies = run_stream(
+            b'post=1',
+            ('post:1', ('comment', 5, comment)),
+            ('post:1', ('post', 7, None)),
+            ('post:1', ('post', 7, None)),
+            ('post:2', ('comment', 6, comment)),
+        )
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            start['headers'],
+        )
+        self.assertEqual(
+            [body['body'] for body in bodies],
+            [comment, b'event: posts\ndata: {"count": 1}\n\n'],
+        )
+        self.assertEqual(dict(hub.channels), {})
+
+    def test_feed_requires_login(self):
+        start, body = run_stream(b'')
+        self.assertEqual(start['status'], 403)
+
+    def test_feed_subscribes_to_authors_and_groups(self):
+        reader = User.objects.create(username='reader')
+        author = User.objects.create(username='author')
+        group = Group.objects.create(title='Группа', slug='group')
+        Follow.objects.create(user=reader, author=author)
+        GroupFollow.objects.create(user=reader, group=group)
+        client = Client()
+        client.force_login(reader)
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        cookie = f'{settings.SESSION_COOKIE_NAME}={session}'.encode()
+        self.assertEqual(
+            subscriptions({'headers': [(b'cookie', cookie)]}),
+            [f'author:{author.id}', f'group:{group.id}'],
+        )
+
+    def test_wsgi_stops_event_source(self):
+        response = Client().get(settings.SSE_PATH)
+        self.assertEqual(response.status_code, 204)
@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+
+from ..feeds import fan_out
+from ..models import FeedEntry, Follow, Group, GroupFollow, Post, User
+
+FOLLOW_INDEX_URL = reverse('posts:follow_index')
+CREATE_URL = reverse('posts:post_create')
+
+
+@override_settings(TASK_BROKER='eager', FEED_FANOUT_THRESHOLD=2)
+class HybridFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create(username='reader')
+        cls.reader2 = User.objects.create(username='reader2')
+        cls.author = User.objects.create(username='author')
+        cls.hot_author = User.objects.create(username='hot_author')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Follow.objects.create(user=cls.reader, author=cls.hot_author)
+        Follow.objects.create(user=cls.reader2, author=cls.hot_author)
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset('feed.')
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def create_post(self, author, text):
+        client = Client()
+        client.force_login(author)
+        client.post(CREATE_URL, data={'text': text})
+        return Post.objects.get(text=text)
+
+    def test_small_author_pushed_hot_author_pulled(self):
+        post = self.create_post(self.author, 'Пост автора')
+        hot_post = self.create_post(self.hot_author, 'Пост популярного')
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+        self.assertFalse(FeedEntry.objects.filter(post=hot_post).exists())
+        self.assertEqual(metrics.get('feed.push.posts'), 1)
+        self.assertEqual(metrics.get('feed.pull.posts'), 1)
+        response = self.reader_client.get(FOLLOW_INDEX_URL)
+        self.assertEqual(
+            list(response.context['page_obj']), [hot_post, post]
+        )
+        self.assertEqual(metrics.get('feed.push.rows'), 1)
+        self.assertEqual(metrics.get('feed.pull.rows'), 1)
+
+    def test_follow_and_unfollow_update_feed(self):
+        post = self.create_post(self.author, 'Пост автора')
+        follow = Follow.objects.create(user=self.reader2, author=self.author)
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.reader2, post=post).exists()
+        )
+        follow.delete()
+        self.assertFalse(FeedEntry.objects.filter(user=self.reader2).exists())
+
+    @override_settings(FEED_FANOUT_THRESHOLD=3)
+    def test_fan_out_counts_added_entries(self):
+        post = self.create_post(self.author, 'Пост автора')
+        self.assertEqual(metrics.get('feed.push.entries'), 1)
+        with override_settings(TASK_BROKER='db'):
+            Follow.objects.create(user=self.reader2, author=self.author)
+        self.assertEqual(fan_out(post), 1)
+        self.assertEqual(fan_out(post), 0)
+        self.assertEqual(metrics.get('feed.push.entries'), 2)
+
+    @override_settings(FEED_MODE='pull')
+    def test_pull_mode(self):
+        post = self.create_post(self.author, 'Пост автора')
+        response = self.reader_client.get(FOLLOW_INDEX_URL)
+        self.assertEqual(list(response.context['page_obj']), [post])
+        self.assertFalse(FeedEntry.objects.exists())
+
+
+@override_settings(TASK_BROKER='eager', FEED_FANOUT_THRESHOLD=2)
+class GroupFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='author')
+        cls.stranger = User.objects.create(username='stranger')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_group_posts_merged_without_duplicates(self):
+        self.reader_client.get(
+            reverse('posts:group_follow', kwargs={'slug': self.group.slug})
+        )
+        self.assertTrue(
+            GroupFollow.objects.filter(
+                user=self.reader, group=self.group
+            ).exists()
+        )
+        both = Post.objects.create(
+            text='Автор в группе', author=self.author, group=self.group
+        )
+        group_post = Post.objects.create(
+            text='Чужой в группе', author=self.stranger, group=self.group
+        )
+        Post.objects.create(text='Чужой без группы', author=self.stranger)
+        author_post = Post.objects.create(
+            text='Автор без группы', author=self.author
+        )
+        expected = [author_post, group_post, both]
+        page = self.reader_client.get(FOLLOW_INDEX_URL).context['page_obj']
+        self.assertEqual(list(page), expected)
+        self.assertEqual(page.paginator.count, 3)
+        with self.settings(FEED_MODE='pull'):
+            page = self.reader_client.get(
+                FOLLOW_INDEX_URL
+            ).context['page_obj']
+            self.assertEqual(list(page), expected)
+
+    def test_group_unfollow(self):
+        GroupFollow.objects.create(user=self.reader, group=self.group)
+        self.reader_client.get(
+            reverse('posts:group_unfollow', kwargs={'slug': self.group.slug})
+        )
+        self.assertFalse(GroupFollow.objects.exists())
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.bloom import BloomFilter
+
+from ..following import following_among, following_index
+from ..models import Follow, User
+
+
+class FollowingCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create(username='reader')
+        cls.authors = [
+            User.objects.create(username=f'author{number}')
+            for number in range(4)
+        ]
+        for author in cls.authors[:3]:
+            Follow.objects.create(user=cls.reader, author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+        self.author_ids = [author.id for author in self.authors]
+
+    def test_page_checks_come_from_one_cache_read(self):
+        following_among(self.reader, self.author_ids)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                following_among(self.reader, self.author_ids),
+                set(self.author_ids[:3]),
+            )
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(FOLLOWING_BLOOM_MIN=2)
+    def test_bloom_positives_are_confirmed(self):
+        self.assertIsInstance(following_index(self.reader), BloomFilter)
+        self.assertEqual(
+            following_among(self.reader, self.author_ids),
+            set(self.author_ids[:3]),
+        )
+
+    def test_follow_and_unfollow_update_cache(self):
+        author = self.authors[3]
+        profile_url = reverse(
+            'posts:profile', kwargs={'username': author.username}
+        )
+        self.authorized_client.get(profile_url)
+        self.authorized_client.get(reverse(
+            'posts:profile_follow', kwargs={'username': author.username}
+        ))
+        self.assertTrue(
+            self.authorized_client.get(profile_url).context['following']
+        )
+        self.authorized_client.get(reverse(
+            'posts:profile_unfollow', kwargs={'username': author.username}
+        ))
+        self.assertFalse(
+            self.authorized_client.get(profile_url).context['following']
+        )
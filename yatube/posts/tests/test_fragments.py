@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Post, User
+
+PROFILE_URL = reverse('posts:profile', kwargs={'username': 'author'})
+PROFILE_FRAGMENT_URL = reverse(
+    'posts:profile_fragment', kwargs={'username': 'author'}
+)
+FOLLOW_FRAGMENT_URL = reverse('posts:follow_fragment')
+POSTS_COUNT = 25
+
+
+class FragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author)
+            for number in range(POSTS_COUNT)
+        )
+        cls.posts = list(Post.objects.order_by('-pub_date', '-id'))
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def scroll(self, client, url):
+        """Проходит по курсорам до конца, отдаёт посты всех порций."""
+        posts = []
+        while url:
+            response = client.get(url)
+            self.assertTemplateUsed(
+                response, 'posts/includes/post_cards.html'
+            )
+            self.assertTemplateNotUsed(response, 'base.html')
+            posts.extend(response.context['posts'])
+            url = response.get('X-Next-Url')
+        return posts
+
+    def test_page_continues_with_fragments(self):
+        page = self.guest_client.get(PROFILE_URL).context['page_obj']
+        posts = list(page) + self.scroll(
+            self.guest_client,
+            f'{PROFILE_FRAGMENT_URL}?cursor={page.next_cursor}',
+        )
+        self.assertEqual(posts, self.posts)
+
+    def test_follow_fragments(self):
+        self.assertEqual(
+            self.scroll(self.reader_client, FOLLOW_FRAGMENT_URL), self.posts
+        )
+
+    def test_fragment_is_cached_per_cursor(self):
+        self.guest_client.get(PROFILE_FRAGMENT_URL)
+        Post.objects.filter(id=self.posts[0].id).update(text='Правка')
+        response = self.guest_client.get(PROFILE_FRAGMENT_URL)
+        self.assertNotContains(response, 'Правка')
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_like_returns_to_list(self):
+        cases = {
+            PROFILE_FRAGMENT_URL: PROFILE_URL,
+            FOLLOW_FRAGMENT_URL: reverse('posts:follow_index'),
+        }
+        for fragment_url, list_url in cases.items():
+            with self.subTest(url=fragment_url):
+                response = self.reader_client.get(fragment_url)
+                self.assertEqual(response.context['back_url'], list_url)
+
+    def test_bad_cursor_not_found(self):
+        response = self.guest_client.get(f'{PROFILE_FRAGMENT_URL}?cursor=x')
+        self.assertEqual(response.status_code, 404)
+
+    def test_out_of_range_cursor_not_found(self):
+        for cursor in ('99999999999999999999.1', '-99999999999999999.1'):
+            with self.subTest(cursor=cursor):
+                response = self.reader_client.get(
+                    f'{FOLLOW_FRAGMENT_URL}?cursor={cursor}'
+                )
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,134 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..likes import collapse, like_counts, liked_ids, set_likes
+from ..models import Like, LikeShard, Post, User
+
+PROFILE_URL = reverse('posts:profile', kwargs={'username': 'author'})
+
+
+@override_settings(LIKE_SHARDS=4)
+class LikeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.readers = [
+            User.objects.create(username=f'reader{number}')
+            for number in range(5)
+        ]
+        cls.posts = [
+            Post.objects.create(text=f'Пост {number}', author=cls.author)
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.reader = self.readers[0]
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def test_set_likes_is_idempotent(self):
+        post_ids = [post.id for post in self.posts]
+        self.assertEqual(set_likes(self.reader, post_ids), set(post_ids))
+        self.assertEqual(set_likes(self.reader, post_ids), set())
+        self.assertEqual(Like.objects.count(), 3)
+        self.assertEqual(liked_ids(self.reader), set(post_ids))
+        set_likes(self.reader, post_ids[:1], liked=False)
+        set_likes(self.reader, post_ids[:1], liked=False)
+        self.assertEqual(liked_ids(self.reader), set(post_ids[1:]))
+        self.assertEqual(like_counts(post_ids), {
+            post_ids[0]: 0, post_ids[1]: 1, post_ids[2]: 1,
+        })
+
+    def test_counts_are_summed_over_shards(self):
+        post = self.posts[0]
+        for reader in self.readers:
+            set_likes(reader, [post.id])
+        self.assertEqual(
+            LikeShard.objects.filter(post=post).count(), 4
+        )
+        self.assertEqual(like_counts([post.id]), {post.id: 5})
+        self.assertEqual(collapse(), 1)
+        post.refresh_from_db()
+        self.assertEqual(post.likes, 5)
+
+    def test_like_view_sets_requested_state(self):
+        post = self.posts[0]
+        url = reverse('posts:post_like', kwargs={'post_id': post.id})
+        for _ in range(2):
+            response = self.authorized_client.post(
+                url, {'like': '1', 'next': PROFILE_URL}
+            )
+        self.assertRedirects(response, PROFILE_URL)
+        self.assertEqual(like_counts([post.id]), {post.id: 1})
+        self.authorized_client.post(url, {'like': '0'})
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(
+            self.authorized_client.get(url).status_code, 405
+        )
+
+    def test_page_marks_liked_posts_with_one_lookup(self):
+        set_likes(self.reader, [self.posts[1].id])
+        self.authorized_client.get(PROFILE_URL)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(PROFILE_URL)
+        likes_queries = [
+            query for query in queries.captured_queries
+            if 'posts_like' in query['sql']
+        ]
+        self.assertEqual(likes_queries, [])
+        page = response.context['page_obj']
+        self.assertEqual(
+            [post.is_liked for post in page], [False, True, False]
+        )
+        self.assertEqual([post.like_count for post in page], [0, 1, 0])
+
+    def test_deltas_follow_written_rows(self):
+        post = self.posts[0]
+        # Строку уже вставил параллельный запрос: шард менять нельзя.
+        Like.objects.create(user=self.reader, post=post)
+        self.assertEqual(set_likes(self.reader, [post.id]), set())
+        set_likes(self.readers[1], [post.id])
+        self.assertEqual(like_counts([post.id]), {post.id: 1})
+        Like.objects.filter(user=self.reader).delete()
+        self.assertEqual(
+            set_likes(self.reader, [post.id], liked=False), set()
+        )
+        self.assertEqual(like_counts([post.id]), {post.id: 1})
+
+    def test_cached_index_shows_new_like(self):
+        index_url = reverse('posts:index')
+        post = self.posts[0]
+        self.authorized_client.get(index_url)
+        self.authorized_client.post(
+            reverse('posts:post_like', kwargs={'post_id': post.id}),
+            {'like': '1'},
+        )
+        response = self.authorized_client.get(index_url)
+        page = response.context['page_obj']
+        self.assertTrue(
+            [card.is_liked for card in page if card.id == post.id][0]
+        )
+
+    def test_like_from_second_session_after_cache_hit(self):
+        index_url = reverse('posts:index')
+        post = self.posts[0]
+        self.authorized_client.get(index_url)
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.reader)
+        content = client.get(index_url).content.decode()
+        token = re.search(
+            r'name="csrfmiddlewaretoken" value="([^"]+)"', content
+        ).group(1)
+        response = client.post(
+            reverse('posts:post_like', kwargs={'post_id': post.id}),
+            {'like': '1', 'csrfmiddlewaretoken': token},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(like_counts([post.id]), {post.id: 1})
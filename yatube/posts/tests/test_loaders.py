@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.loaders import attach
+
+from ..models import Comment, Group, Post, User
+
+SLUG = 'test-slug'
+
+
+class IdentityMapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(title='Группа', slug=SLUG)
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.author, group=cls.group
+        )
+        cls.post_url = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.id}
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        # Прогрев кеша сессии и пользователя.
+        self.authorized_client.get(self.post_url)
+
+    def comment(self, count):
+        Comment.objects.bulk_create(
+            Comment(
+                post=self.post, text=f'Комментарий {i}',
+                author=(self.author, self.reader)[i % 2],
+            )
+            for i in range(count)
+        )
+
+    def detail_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(self.post_url)
+        return response, len(queries)
+
+    def test_post_detail_queries_do_not_grow_with_comments(self):
+        self.comment(2)
+        _, few = self.detail_queries()
+        self.comment(20)
+        _, many = self.detail_queries()
+        self.assertEqual(few, many)
+
+    def test_same_instance_for_repeat_authors(self):
+        self.comment(4)
+        response, _ = self.detail_queries()
+        post = response.context['post']
+        authors = [comment.author for comment in response.context['comments']]
+        self.assertIs(authors[0], post.author)
+        self.assertIs(authors[0], authors[2])
+        self.assertIs(authors[1], authors[3])
+        self.assertIs(post.author, response.wsgi_request.user._wrapped)
+
+    def test_attach_batches_loads(self):
+        self.comment(6)
+        comments = list(Comment.objects.all())
+        with self.assertNumQueries(1):
+            attach(comments, 'author')
+        self.assertEqual(
+            {comment.author.username for comment in comments},
+            {'author', 'reader'},
+        )
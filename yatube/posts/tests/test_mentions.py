@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..mentions import index
+from ..models import Comment, Mention, Post, User
+
+MENTIONS_URL = reverse('posts:mention_list')
+
+
+class MentionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.other = User.objects.create(username='other.name')
+
+    def setUp(self):
+        index.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def mentioned(self):
+        return sorted(Mention.objects.values_list('user__username', 'comment'))
+
+    def test_post_mentions_link_and_notify_once(self):
+        post = Post.objects.create(
+            text='Привет, @reader и @other.name. Письмо: a@reader.ru @nobody',
+            author=self.author,
+        )
+        profile_url = reverse('posts:profile', args=['reader'])
+        self.assertIn(f'<a href="{profile_url}">@reader</a>', post.text_html)
+        self.assertIn('@other.name</a>.', post.text_html)
+        self.assertIn('@nobody', post.text_html)
+        self.assertNotIn('/profile/nobody/', post.text_html)
+        self.assertEqual(
+            self.mentioned(), [('other.name', None), ('reader', None)]
+        )
+        post.text += ' и снова @reader, @author'
+        post.save()
+        self.assertEqual(Mention.objects.count(), 2)
+
+    def test_comment_mentions_notify(self):
+        post = Post.objects.create(text='Пост', author=self.author)
+        comment = Comment.objects.create(
+            post=post, author=self.author, text='@reader, смотри'
+        )
+        self.assertEqual(self.mentioned(), [('reader', comment.id)])
+        self.assertIn('/profile/reader/', comment.text_html)
+
+    @override_settings(MENTION_INDEX_TIMEOUT=3600)
+    def test_index_batches_lookups(self):
+        index.resolve({'author'})
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                index.resolve({'author', 'reader'}),
+                {'author': self.author.id, 'reader': self.reader.id},
+            )
+        User.objects.create(username='newcomer')
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                set(index.resolve({'newcomer', 'ghost1', 'ghost2'})),
+                {'newcomer'},
+            )
+
+    def test_render_posts_links_mentions(self):
+        Post.objects.bulk_create([Post(text='@reader', author=self.author)])
+        call_command('render_posts', stdout=StringIO())
+        self.assertIn(
+            '/profile/reader/', Post.objects.get().text_html
+        )
+
+    @override_settings(MENTION_INDEX_TIMEOUT=3600)
+    def test_deleted_user_in_index_is_not_notified(self):
+        gone = User.objects.create(username='gone')
+        index.resolve({'gone'})
+        gone.delete()
+        Post.objects.create(text='@gone и @reader', author=self.author)
+        self.assertEqual(
+            list(Mention.objects.values_list('user_id', flat=True)),
+            [self.reader.id],
+        )
+
+    def test_mention_list_marks_read(self):
+        Post.objects.create(text='@reader', author=self.author)
+        response = self.reader_client.get(MENTIONS_URL)
+        self.assertEqual(len(response.context['page_obj']), 1)
+        self.assertFalse(Mention.objects.filter(is_read=False).exists())
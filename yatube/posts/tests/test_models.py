@@ -1,3 +1,6 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
 from ..models import Group, Post, User
@@ -45,3 +48,23 @@ class PostModelTest(TestCase):
                 self.assertEqual(
                     Post._meta.get_field(field).help_text, expected_value
                 )
+
+    def test_rendered_text_follows_text(self):
+        post = Post.objects.create(
+            author=self.user, text='<b>Первая</b>\n' + 'слово ' * 100
+        )
+        self.assertTrue(post.text_html.startswith('&lt;b&gt;Первая'))
+        self.assertIn('<br>', post.text_html)
+        self.assertEqual(post.word_count, 101)
+        self.assertTrue(post.excerpt.endswith('…'))
+        self.assertLess(len(post.excerpt), len(post.text_html))
+        post.text = 'Новый текст'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, 'Новый текст')
+        self.assertEqual(post.word_count, 2)
+
+    def test_render_posts_backfills_bulk_created_posts(self):
+        Post.objects.bulk_create([Post(author=self.user, text='Без анонса')])
+        call_command('render_posts', stdout=StringIO())
+        self.assertFalse(Post.objects.filter(text_html='').exists())
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import DigestDelivery, Follow, NotificationDigest, Post, User
+from ..notifications import send_digests
+
+
+@override_settings(DIGEST_SAFETY_LAG=0)
+class DigestTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.other_author = User.objects.create(username='other_author')
+        cls.reader = User.objects.create(
+            username='reader', email='reader@yatube.ru'
+        )
+        cls.reader2 = User.objects.create(
+            username='reader2', email='reader2@yatube.ru'
+        )
+        cls.no_email = User.objects.create(username='no_email')
+        for user in (cls.reader, cls.reader2, cls.no_email):
+            Follow.objects.create(user=user, author=cls.author)
+        Follow.objects.create(user=cls.reader, author=cls.other_author)
+        cls.posts = [
+            Post.objects.create(text=f'Пост {i}', author=author)
+            for i, author in enumerate(
+                (cls.author, cls.other_author, cls.author)
+            )
+        ]
+
+    def test_one_digest_per_recipient(self):
+        digest = send_digests(batch_size=1)
+        self.assertEqual(digest.emails, 2)
+        self.assertEqual(digest.posts, 3)
+        self.assertEqual(len(mail.outbox), 2)
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertIn('(3)', messages['reader@yatube.ru'].subject)
+        self.assertIn('(2)', messages['reader2@yatube.ru'].subject)
+        self.assertIn(
+            f'/posts/{self.posts[1].id}/', messages['reader@yatube.ru'].body
+        )
+
+    def test_next_digest_starts_after_previous_period(self):
+        send_digests()
+        mail.outbox.clear()
+        digest = send_digests(until=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(digest.emails, 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(NotificationDigest.objects.count(), 2)
+
+    @override_settings(DIGEST_SAFETY_LAG=60)
+    def test_fresh_posts_wait_for_next_digest(self):
+        digest = send_digests()
+        self.assertEqual(digest.posts, 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_interrupted_digest_resumes_without_duplicates(self):
+        send = EmailBackend.send_messages
+        calls = []
+
+        def flaky(backend, messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise SMTPException('Сервер недоступен')
+            return send(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', flaky):
+            with self.assertRaises(SMTPException):
+                send_digests(batch_size=1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(DigestDelivery.objects.count(), 1)
+        digest = send_digests(batch_size=1)
+        self.assertTrue(digest.is_finished)
+        self.assertEqual(digest.emails, 2)
+        self.assertEqual(NotificationDigest.objects.count(), 1)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['reader2@yatube.ru', 'reader@yatube.ru'],
+        )
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, User
+from ..pagination import seek_cache_key
+from ..timelines import hydrate, pack, to_micros, unpack
+
+USERNAME = 'author'
+PROFILE_URL = reverse('posts:profile', kwargs={'username': USERNAME})
+POSTS = 40
+PAGE_SIZE = 3
+STEP = 5
+
+
+@override_settings(
+    PAGINATION_VALUE=PAGE_SIZE, PAGINATION_SEEK_STEP=STEP, TIMELINE_LENGTH=6
+)
+class SeekPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=USERNAME)
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=cls.user) for i in range(POSTS)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def seek_index(self):
+        return cache.get(seek_cache_key(f'author:{self.user.id}'))
+
+    def page_ids(self, number):
+        response = self.guest_client.get(PROFILE_URL, {'page': number})
+        return [post.id for post in response.context['page_obj']]
+
+    def expected_ids(self, number):
+        ids = list(
+            Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        return ids[(number - 1) * PAGE_SIZE:number * PAGE_SIZE]
+
+    def test_deep_pages_match_offset_pages(self):
+        for number in range(1, POSTS // PAGE_SIZE + 2):
+            with self.subTest(page=number):
+                self.assertEqual(
+                    self.page_ids(number), self.expected_ids(number)
+                )
+
+    def test_new_posts_shift_index_without_rebuild(self):
+        self.page_ids(10)
+        index = self.seek_index()
+        for i in range(4):
+            Post.objects.create(text=f'Новый {i}', author=self.user)
+        self.assertEqual(self.page_ids(10), self.expected_ids(10))
+        self.assertEqual(self.seek_index(), index)
+
+    def test_delete_resets_index(self):
+        self.page_ids(10)
+        Post.objects.filter(id=self.expected_ids(12)[0]).get().delete()
+        self.assertIsNone(self.seek_index())
+        self.assertEqual(self.page_ids(12), self.expected_ids(12))
+
+    def test_page_links_are_elided(self):
+        response = self.guest_client.get(PROFILE_URL, {'page': 7})
+        paginator = response.context['page_obj'].paginator
+        ellipsis = paginator.ELLIPSIS
+        self.assertEqual(
+            paginator.window, [1, ellipsis, 5, 6, 7, 8, 9, ellipsis, 14]
+        )
+        self.assertNotContains(response, '?page=12"')
+
+
+class TimelinePackingTests(TestCase):
+    def test_pack_roundtrip(self):
+        user = User.objects.create(username=USERNAME)
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=user) for i in range(200)
+        )
+        rows = list(Post.objects.values_list('id', 'pub_date'))
+        count, entries = unpack(pack(len(rows), rows))
+        self.assertEqual(count, len(rows))
+        self.assertEqual(
+            entries, [(pk, to_micros(pub_date)) for pk, pub_date in rows]
+        )
+        self.assertEqual(
+            [post.id for post in hydrate([pk for pk, _ in entries])],
+            [pk for pk, _ in rows],
+        )
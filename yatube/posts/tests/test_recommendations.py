@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Recommendation, User
+from ..recommendations import FollowGraph, rebuild, recommended_authors
+
+FOLLOW_URL = reverse('posts:follow_index')
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = {
+            name: User.objects.create(username=name)
+            for name in ('reader', 'anna', 'boris', 'vera', 'gleb', 'dina')
+        }
+        edges = [
+            ('reader', 'anna'), ('reader', 'boris'),
+            ('anna', 'vera'), ('boris', 'vera'), ('anna', 'gleb'),
+            ('boris', 'reader'), ('gleb', 'dina'),
+        ]
+        Follow.objects.bulk_create(
+            Follow(user=cls.users[user], author=cls.users[author])
+            for user, author in edges
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.reader = self.users['reader']
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def test_graph_holds_follows_as_csr(self):
+        graph = FollowGraph.load()
+        following = {
+            graph.user_ids[pos]: sorted(
+                graph.user_ids[author] for author in graph.following(pos)
+            )
+            for pos in range(len(graph))
+        }
+        self.assertEqual(following[self.reader.id], sorted(
+            [self.users['anna'].id, self.users['boris'].id]
+        ))
+        self.assertEqual(following[self.users['dina'].id], [])
+
+    def test_friends_of_friends_ranked_by_shared_follows(self):
+        self.assertEqual(rebuild(limit=5), 4)
+        self.assertEqual(
+            list(self.reader.recommendations.values_list(
+                'author__username', 'score'
+            )),
+            [('vera', 2), ('gleb', 1)],
+        )
+        response = self.authorized_client.get(FOLLOW_URL)
+        self.assertEqual(
+            [author.username for author in response.context['recommended']],
+            ['vera', 'gleb'],
+        )
+
+    def test_follow_removes_recommendation(self):
+        rebuild()
+        recommended_authors(self.reader)
+        self.authorized_client.get(
+            reverse('posts:profile_follow', kwargs={'username': 'vera'})
+        )
+        self.assertFalse(Recommendation.objects.filter(
+            user=self.reader, author=self.users['vera']
+        ).exists())
+        self.assertEqual(
+            [author.username for author in recommended_authors(self.reader)],
+            ['gleb'],
+        )
@@ -11,6 +11,10 @@ class PostsRoutesTests(TestCase):
         urls = [
             ['/', 'posts:index', {}],
             ['/create/', 'posts:post_create', {}],
+            ['/trending/', 'posts:trending', {}],
+            ['/groups/', 'posts:group_index', {}],
+            ['/mentions/', 'posts:mention_list', {}],
+            ['/tag/django/', 'posts:tag_posts', {'name': 'django'}],
             [f'/profile/{USERNAME}/', 'posts:profile',
              {'username': USERNAME}],
             [f'/group/{GROUP_SLUG}/', 'posts:group_posts',
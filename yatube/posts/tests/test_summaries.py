@@ -0,0 +1,53 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, GroupSummary, Post, User
+
+GROUP_INDEX_URL = reverse('posts:group_index')
+SLUG = 'test-slug'
+SLUG2 = 'test-slug2'
+GROUP_URL = reverse('posts:group_posts', kwargs={'slug': SLUG})
+
+
+class GroupSummaryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='author')
+        cls.group = Group.objects.create(title='Группа', slug=SLUG)
+        cls.group2 = Group.objects.create(title='Группа 2', slug=SLUG2)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def summary(self, group):
+        return GroupSummary.objects.get(group=group)
+
+    def test_summary_follows_post_changes(self):
+        first = Post.objects.create(
+            text='Первый', author=self.user, group=self.group
+        )
+        last = Post.objects.create(
+            text='Второй', author=self.user, group=self.group
+        )
+        self.assertEqual(self.summary(self.group).posts_count, 2)
+        self.assertEqual(self.summary(self.group).last_pub_date, last.pub_date)
+        last.group = self.group2
+        last.save()
+        self.assertEqual(self.summary(self.group).posts_count, 1)
+        self.assertEqual(
+            self.summary(self.group).last_pub_date, first.pub_date
+        )
+        self.assertEqual(self.summary(self.group2).posts_count, 1)
+        first.delete()
+        self.assertEqual(self.summary(self.group).posts_count, 0)
+        self.assertIsNone(self.summary(self.group).last_pub_date)
+
+    def test_group_pages_read_summary(self):
+        Post.objects.create(text='Пост', author=self.user, group=self.group)
+        response = self.guest_client.get(GROUP_INDEX_URL)
+        self.assertContains(response, 'Постов: 1')
+        self.assertContains(response, GROUP_URL)
+        response = self.guest_client.get(GROUP_URL)
+        self.assertEqual(response.context['summary'].posts_count, 1)
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, Tag, User
+from ..tags import trending
+
+TAG_URL = reverse('posts:tag_posts', kwargs={'name': 'django'})
+
+
+class HashtagTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='author')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def counts(self):
+        return dict(Tag.objects.values_list('name', 'posts_count'))
+
+    def test_tags_follow_post_text(self):
+        post = Post.objects.create(
+            text="#Django и #python, it's #django", author=self.user
+        )
+        self.assertEqual(self.counts(), {'django': 1, 'python': 1})
+        self.assertIn(f'<a href="{TAG_URL}">#Django</a>', post.text_html)
+        post.text = 'Только #python'
+        post.save()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 1})
+        post.delete()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 0})
+
+    def test_tag_page_lists_tagged_posts(self):
+        tagged = Post.objects.create(text='Пост #django', author=self.user)
+        Post.objects.create(text='Пост без тега', author=self.user)
+        response = self.guest_client.get(TAG_URL)
+        self.assertEqual(list(response.context['page_obj']), [tagged])
+        self.assertEqual(
+            response.context['trending_tags'],
+            [{'tag__name': 'django', 'posts_count': 1}],
+        )
+
+    @override_settings(
+        PAGINATION_VALUE=3, PAGINATION_SEEK_STEP=5, TIMELINE_LENGTH=3
+    )
+    def test_deep_tag_pages_follow_post_order(self):
+        for number in range(14):
+            Post.objects.create(text=f'#django {number}', author=self.user)
+        Post.objects.create(text='Пост без тега', author=self.user)
+        ids = list(
+            Post.objects.filter(tag_entries__tag__name='django').order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+        for number in range(1, 6):
+            with self.subTest(page=number):
+                response = self.guest_client.get(TAG_URL, {'page': number})
+                self.assertEqual(
+                    [post.id for post in response.context['page_obj']],
+                    ids[(number - 1) * 3:number * 3],
+                )
+
+    @override_settings(
+        PAGINATION_VALUE=3, PAGINATION_SEEK_STEP=5, TIMELINE_LENGTH=3
+    )
+    def test_tagging_old_post_keeps_deep_pages_in_order(self):
+        old = Post.objects.create(text='Старый пост', author=self.user)
+        for number in range(14):
+            Post.objects.create(text=f'#django {number}', author=self.user)
+
+        def page_ids(number):
+            response = self.guest_client.get(TAG_URL, {'page': number})
+            return [post.id for post in response.context['page_obj']]
+
+        page_ids(5)
+        old.text = 'Старый пост #django'
+        old.save()
+        ids = list(
+            Post.objects.filter(tag_entries__tag__name='django').order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+        self.assertEqual(ids[-1], old.id)
+        for number in range(1, 6):
+            with self.subTest(page=number):
+                self.assertEqual(
+                    page_ids(number), ids[(number - 1) * 3:number * 3]
+                )
+
+    def test_trending_counts_recent_posts(self):
+        for text in ('#a #b', '#a', '#a #c'):
+            Post.objects.create(text=text, author=self.user)
+        self.assertEqual(
+            [item['tag__name'] for item in trending()], ['a', 'b', 'c']
+        )
+
+    def test_unknown_tag_not_found(self):
+        response = self.guest_client.get(
+            reverse('posts:tag_posts', kwargs={'name': 'missing'})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Comment, Follow, Post, PostScore, User
+from ..trending import decay
+
+TRENDING_URL = reverse('posts:trending')
+
+
+@override_settings(
+    TRENDING_COMMENT_WEIGHT=1.0, TRENDING_FOLLOW_WEIGHT=2.0,
+    TRENDING_HALF_LIFE=600, TRENDING_MIN_SCORE=0.3,
+)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.old = Post.objects.create(text='Старый', author=cls.author)
+        cls.new = Post.objects.create(text='Новый', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def score(self, post):
+        return PostScore.objects.get(post=post).score
+
+    def comment(self, post, count=1):
+        for i in range(count):
+            Comment.objects.create(
+                post=post, author=self.reader, text=f'Комментарий {i}'
+            )
+
+    def test_activity_adds_weight(self):
+        self.comment(self.old, 3)
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.assertEqual(self.score(self.old), 3)
+        self.assertEqual(self.score(self.new), 2)
+
+    def test_decay_halves_and_drops_faded_scores(self):
+        self.comment(self.old, 2)
+        self.comment(self.new)
+        decay(interval=600)
+        self.assertEqual(self.score(self.old), 1)
+        decay(interval=600)
+        self.assertEqual(self.score(self.old), 0.5)
+        self.assertFalse(PostScore.objects.filter(post=self.new).exists())
+
+    def test_page_orders_by_score(self):
+        self.comment(self.old, 2)
+        self.comment(self.new)
+        response = self.guest_client.get(TRENDING_URL)
+        self.assertEqual(
+            list(response.context['page_obj']), [self.old, self.new]
+        )
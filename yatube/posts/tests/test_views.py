@@ -147,6 +147,19 @@ class PostsPagesTests(TestCase):
         post = response.context['post']
         check_post_info(post)
 
+    def test_post_detail_uses_rendered_fields(self):
+        post = Post.objects.create(
+            text='<i>Начало</i> длинного поста ' + 'слово ' * 30,
+            author=self.author,
+        )
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.id})
+        )
+        self.assertContains(
+            response, '<title> Пост &lt;i&gt;Начало&lt;/i&gt; длин'
+        )
+        self.assertContains(response, 'Слов: 33')
+
     def test_index_cache(self):
         first_content = self.authorized_client.get(
             INDEX_URL
@@ -0,0 +1,121 @@
+"""Компактные ленты постов в кеше.
+
+Вместо pickle списка постов в кеше лежит упакованный массив пар
+(id, pub_date в микросекундах) — 16 байт на запись, при размере больше
+TIMELINE_COMPRESS_MIN байт сжатый zlib. Первые TIMELINE_LENGTH записей
+списка хранятся под версией списка (core.cache.version), а сами посты
+страницы достаются одним get_many из кеша постов, промахи — одним
+запросом in_bulk.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import get_or_set, version
+
+from .models import Post
+
+HEADER = struct.Struct('<BQ')
+COMPRESSED = 1
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(moment):
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10 ** 6 + delta.microseconds
+
+
+def from_micros(micros):
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def pack(count, rows):
+    """Упаковывает число записей списка и пары (id, pub_date)."""
+    values = array('q')
+    for pk, pub_date in rows:
+        values.append(pk)
+        values.append(to_micros(pub_date))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    body = values.tobytes()
+    flags = 0
+    if len(body) >= settings.TIMELINE_COMPRESS_MIN:
+        body = zlib.compress(body)
+        flags |= COMPRESSED
+    return HEADER.pack(flags, count) + body
+
+
+def unpack(data):
+    """Отдаёт (число записей, список пар (id, микросекунды))."""
+    flags, count = HEADER.unpack_from(data)
+    body = data[HEADER.size:]
+    if flags & COMPRESSED:
+        body = zlib.decompress(body)
+    values = array('q')
+    values.frombytes(body)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return count, list(zip(values[::2], values[1::2]))
+
+
+def post_cache_key(pk):
+    return f'post:{pk}'
+
+
+def hydrate(ids):
+    """Посты по списку id в том же порядке: get_many, затем in_bulk."""
+    keys = {post_cache_key(pk): pk for pk in ids}
+    posts = {
+        keys[key]: post for key, post in cache.get_many(list(keys)).items()
+    }
+    missing = [pk for pk in ids if pk not in posts]
+    if missing:
+        loaded = Post.objects.defer('text').in_bulk(missing)
+        cache.set_many(
+            {post_cache_key(pk): post for pk, post in loaded.items()},
+            settings.TIMELINE_POST_TIMEOUT,
+        )
+        posts.update(loaded)
+    return [posts[pk] for pk in ids if pk in posts]
+
+
+def forget_post(pk):
+    cache.delete(post_cache_key(pk))
+
+
+def head(name, paginator):
+    """Начало списка name: (число записей, пары (id, микросекунды))."""
+    def build():
+        rows = paginator.object_list.values_list(
+            paginator.id_field, 'pub_date'
+        )
+        return pack(paginator.count, rows[:settings.TIMELINE_LENGTH])
+
+    key = f'timeline:{name}:{version(name)}'
+    return unpack(get_or_set(key, build, settings.POSTS_CACHE_TIMEOUT))
+
+
+class IdList:
+    """Последовательность постов по готовому списку id для Paginator:
+    срез страницы собирается через hydrate."""
+
+    ordered = True
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        return hydrate(self.ids[index])
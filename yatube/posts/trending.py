@@ -0,0 +1,82 @@
+"""Популярные посты.
+
+У каждого поста с недавней активностью есть строка PostScore. Комментарий,
+подписка на автора (засчитывается его последнему посту) и просмотры
+прибавляют к ней вес события одним UPDATE. Периодическая команда
+decay_trending умножает все оценки на 0.5 ** (интервал / период
+полураспада) и удаляет угасшие строки, поэтому старая активность весит
+меньше новой. Лента популярного — первые TRENDING_POSTS_LIMIT строк по
+индексу score.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+
+from core import metrics
+from core.cache import get_or_set
+
+from .models import Post, PostScore
+from .timelines import IdList
+
+
+def record(post_id, weight):
+    scores = PostScore.objects.filter(post_id=post_id)
+    if scores.update(score=F('score') + weight):
+        return
+    _, created = PostScore.objects.get_or_create(
+        post_id=post_id, defaults={'score': weight}
+    )
+    if not created:
+        scores.update(score=F('score') + weight)
+
+
+def record_many(weights):
+    """Как record для словаря {id поста: вес}: по UPDATE на каждый вес."""
+    if not weights:
+        return
+    PostScore.objects.bulk_create(
+        [PostScore(post_id=post_id, score=0) for post_id in weights],
+        ignore_conflicts=True,
+    )
+    by_weight = defaultdict(list)
+    for post_id, weight in weights.items():
+        by_weight[weight].append(post_id)
+    for weight, post_ids in by_weight.items():
+        PostScore.objects.filter(post_id__in=post_ids).update(
+            score=F('score') + weight
+        )
+
+
+def record_follow(author_id):
+    latest = Post.objects.filter(author_id=author_id).order_by(
+        '-pub_date'
+    ).values_list('id', flat=True).first()
+    if latest is not None:
+        record(latest, settings.TRENDING_FOLLOW_WEIGHT)
+
+
+def decay(interval=None):
+    """Затухание оценок за interval секунд; отдаёт число удалённых строк."""
+    interval = interval or settings.TRENDING_DECAY_INTERVAL
+    factor = 0.5 ** (interval / settings.TRENDING_HALF_LIFE)
+    PostScore.objects.update(score=F('score') * factor)
+    removed, _ = PostScore.objects.filter(
+        score__lt=settings.TRENDING_MIN_SCORE
+    ).delete()
+    metrics.incr('trending.decays')
+    return removed
+
+
+def top_posts():
+    """Популярные посты как последовательность для posts_page."""
+    def build():
+        return list(
+            PostScore.objects.values_list('post_id', flat=True)[
+                :settings.TRENDING_POSTS_LIMIT
+            ]
+        )
+
+    return IdList(get_or_set(
+        'trending_posts', build, settings.TRENDING_POSTS_TIMEOUT
+    ))
@@ -1,9 +1,84 @@
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.http import Http404
 
+from core.loaders import attach
 
-def posts_page(request, post_list):
-    paginator = Paginator(post_list, settings.PAGINATION_VALUE)
+from . import timelines
+from .counters import attach_views
+from .feeds import MergedTimeline
+from .likes import attach_likes
+from .pagination import SeekPaginator, older_than
+
+
+def attach_cards(posts, user):
+    """Всё, что показывает карточка поста: автор, группа, счётчики."""
+    attach(posts, 'author', 'group')
+    attach_views(posts)
+    return attach_likes(posts, user)
+
+
+def encode_cursor(post):
+    return f'{timelines.to_micros(post.pub_date)}.{post.id}'
+
+
+def decode_cursor(cursor):
+    """(pub_date, id) из курсора; ValueError, если курсор испорчен."""
+    try:
+        micros, pk = cursor.split('.')
+        return timelines.from_micros(int(micros)), int(pk)
+    except (OverflowError, ValueError):
+        # Дата за пределами datetime даёт OverflowError, а не ValueError.
+        raise ValueError(f'Неверный курсор: {cursor!r}')
+
+
+def posts_page(request, post_list, count=None, seek_key=None, cached=False,
+               id_field='id'):
+    """Страница постов; с cached=True начало списка берётся из кеша.
+
+    Кеш списка seek_key сбрасывается новой версией списка (posts.signals)
+    при публикации, правке и удалении поста. У страницы, за которой есть
+    ещё посты, next_cursor — курсор для posts_fragment. id_field — как
+    в SeekPaginator, для списков записей-указателей на посты.
+    """
+    paginator = SeekPaginator(
+        post_list, settings.PAGINATION_VALUE, seek_key=seek_key,
+        id_field=id_field,
+    )
+    if count is not None:
+        # Число записей уже известно (например, из сводки) — без COUNT(*).
+        paginator.count = count
+    if cached:
+        paginator.count, paginator.head = timelines.head(seek_key, paginator)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    posts = attach_cards(list(page_obj.object_list), request.user)
+    page_obj.object_list = posts
+    page_obj.next_cursor = None
+    if posts and page_obj.has_next():
+        page_obj.next_cursor = encode_cursor(posts[-1])
     return page_obj
+
+
+def posts_fragment(request, post_list):
+    """Порция постов после курсора ?cursor= и курсор следующей порции.
+
+    Курсор — (pub_date, id) последнего показанного поста, поэтому
+    порция не зависит от постов, опубликованных позже, и её можно
+    кешировать по адресу.
+    """
+    cursor = request.GET.get('cursor')
+    if not isinstance(post_list, MergedTimeline):
+        post_list = post_list.order_by('-pub_date', '-id')
+    if cursor:
+        try:
+            pub_date, pk = decode_cursor(cursor)
+        except ValueError:
+            raise Http404('Неверный курсор')
+        if isinstance(post_list, MergedTimeline):
+            post_list = post_list.older_than(pub_date, pk)
+        else:
+            post_list = older_than(post_list, pub_date, pk)
+    size = settings.PAGINATION_VALUE
+    posts = list(post_list[:size + 1])
+    next_cursor = encode_cursor(posts[size - 1]) if len(posts) > size else None
+    return attach_cards(posts[:size], request.user), next_cursor
@@ -1,51 +1,199 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import is_safe_url
+from django.views.decorators.http import require_POST
+
+from core.cache import cached_page, permanent_page
+from core.loaders import attach
 
+from .archive import cursor_is_closed, month_bounds, month_is_closed
+from .counters import attach_views, hit
+from .feeds import follow_timeline
+from .following import is_following
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
-from .utils import posts_page
+from .likes import attach_likes, set_likes
+from .models import (Follow, Group, GroupFollow, GroupSummary, Post, Tag,
+                     User)
+from .pagination import SeekPaginator
+from .recommendations import recommended_authors
+from .summaries import get_summary
+from .tags import trending
+from .trending import top_posts
+from .tasks import schedule_post_side_effects
+from .utils import posts_fragment, posts_page
 
 
-@cache_page(20)
+@cached_page(settings.POSTS_CACHE_TIMEOUT)
 def index(request):
     return render(request, 'posts/index.html', {
-        'page_obj': posts_page(request, Post.objects.all()),
+        'page_obj': posts_page(
+            request, Post.objects.defer('text'), seek_key='index'
+        ),
     })
 
 
-def group_posts(request, slug):
+def render_fragment(request, post_list, back_url):
+    """Порция карточек; back_url — адрес списка, куда вернёт лайк."""
+    posts, cursor = posts_fragment(request, post_list)
+    next_url = cursor and f'{request.path}?cursor={cursor}'
+    response = render(request, 'posts/includes/post_cards.html', {
+        'posts': posts,
+        'next_url': next_url,
+        'back_url': back_url,
+    })
+    if next_url:
+        response['X-Next-Url'] = next_url
+    return response
+
+
+@permanent_page(cursor_is_closed, settings.FRAGMENT_CACHE_TIMEOUT)
+def index_fragment(request):
+    return render_fragment(
+        request, Post.objects.defer('text'), reverse('posts:index')
+    )
+
+
+@permanent_page(cursor_is_closed, settings.FRAGMENT_CACHE_TIMEOUT)
+def group_fragment(request, slug):
     group = get_object_or_404(Group, slug=slug)
+    return render_fragment(
+        request, group.posts.defer('text'),
+        reverse('posts:group_posts', kwargs={'slug': slug}),
+    )
+
+
+@permanent_page(cursor_is_closed, settings.FRAGMENT_CACHE_TIMEOUT)
+def profile_fragment(request, username):
+    author = get_object_or_404(User, username=username)
+    return render_fragment(
+        request, author.posts.defer('text'),
+        reverse('posts:profile', kwargs={'username': username}),
+    )
+
+
+@login_required
+@cached_page(settings.FRAGMENT_CACHE_TIMEOUT)
+def follow_fragment(request):
+    return render_fragment(
+        request, follow_timeline(request.user), reverse('posts:follow_index')
+    )
+
+
+def render_archive(request, post_list, year, month, **context):
+    start, end = month_bounds(year, month)
+    previous = start - timedelta(days=1)
+    context.update({
+        'start': start,
+        'previous': (previous.year, previous.month),
+        'next': (end.year, end.month) if end <= timezone.now() else None,
+        'page_obj': posts_page(
+            request, post_list.filter(
+                pub_date__gte=start, pub_date__lt=end
+            ).order_by('-pub_date', '-id').defer('text'),
+        ),
+    })
+    return render(request, 'posts/archive.html', context)
+
+
+@permanent_page(month_is_closed, settings.POSTS_CACHE_TIMEOUT)
+def archive(request, year, month):
+    return render_archive(request, Post.objects.all(), year, month)
+
+
+@permanent_page(month_is_closed, settings.POSTS_CACHE_TIMEOUT)
+def group_archive(request, slug, year, month):
+    group = get_object_or_404(Group, slug=slug)
+    return render_archive(
+        request, group.posts.all(), year, month, group=group
+    )
+
+
+@permanent_page(month_is_closed, settings.POSTS_CACHE_TIMEOUT)
+def profile_archive(request, username, year, month):
+    author = get_object_or_404(User, username=username)
+    return render_archive(
+        request, author.posts.all(), year, month, author=author
+    )
+
+
+def trending_index(request):
+    return render(request, 'posts/trending.html', {
+        'page_obj': posts_page(request, top_posts()),
+    })
+
+
+def group_index(request):
+    return render(request, 'posts/groups.html', {
+        'summaries': GroupSummary.objects.select_related('group'),
+        'trending_tags': trending(),
+    })
+
+
+def group_posts(request, slug):
+    group = get_object_or_404(
+        Group.objects.select_related('summary'), slug=slug
+    )
+    summary = get_summary(group)
+    following = (
+        request.user.is_authenticated
+        and group.followers.filter(user=request.user).exists()
+    )
     return render(request, 'posts/group_list.html', {
         'group': group,
-        'page_obj': posts_page(request, group.posts.all()),
+        'summary': summary,
+        'following': following,
+        'page_obj': posts_page(
+            request, group.posts.defer('text'), count=summary.posts_count,
+            seek_key=f'group:{group.id}', cached=True,
+        ),
+    })
+
+
+def tag_posts(request, name):
+    tag = get_object_or_404(Tag, name=name.lower())
+    return render(request, 'posts/tag_list.html', {
+        'tag': tag,
+        'trending_tags': trending(),
+        'page_obj': posts_page(
+            request, tag.entries.all(), count=tag.posts_count,
+            seek_key=f'tag:{tag.id}', cached=True, id_field='post_id',
+        ),
     })
 
 
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    following = (
-        request.user.is_authenticated
-        and author != request.user
-        and Follow.objects.filter(
-            author=author,
-            user=request.user
-        ).exists()
+    following = author != request.user and is_following(
+        request.user, author
     )
     return render(request, 'posts/profile.html', {
         'following': following,
         'author': author,
-        'page_obj': posts_page(request, author.posts.all()),
+        'recommended': recommended_authors(request.user),
+        'page_obj': posts_page(
+            request, author.posts.defer('text'),
+            seek_key=f'author:{author.id}', cached=True,
+        ),
     })
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    # Полный текст не нужен: страница показывает готовый text_html.
+    post = get_object_or_404(Post.objects.defer('text'), id=post_id)
+    hit(post.id)
+    attach([post], 'author', 'group')
+    attach_likes(attach_views([post]), request.user)
     form = CommentForm(request.POST or None)
     return render(request, 'posts/post_detail.html', {
         'post': post,
         'form': form,
-        'comments': post.comments.all()
+        'comments': attach(list(post.comments.all()), 'author'),
+        'events_url': f'{settings.SSE_PATH}?post={post.id}',
     })
 
 
@@ -61,6 +209,7 @@ def post_edit(request, post_id):
     )
     if form.is_valid():
         form.save()
+        schedule_post_side_effects(post)
         return redirect('posts:post_detail', post_id=post.id)
     return render(request, 'posts/create_post.html', {
         'form': form,
@@ -81,6 +230,7 @@ def post_create(request):
     post = form.save(commit=False)
     post.author = request.user
     form.save()
+    schedule_post_side_effects(post)
     return redirect('posts:profile', username=request.user.username)
 
 
@@ -96,13 +246,43 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@login_required
+@require_POST
+def post_like(request, post_id):
+    post = get_object_or_404(Post, id=post_id)
+    # Форма передаёт нужное состояние, а не «переключить»: повторная
+    # отправка не снимает только что поставленный лайк.
+    set_likes(request.user, [post.id], liked=request.POST.get('like') == '1')
+    next_url = request.POST.get('next')
+    if not is_safe_url(next_url, allowed_hosts={request.get_host()}):
+        return redirect('posts:post_detail', post_id=post.id)
+    return redirect(next_url)
+
+
 @login_required
 def follow_index(request):
-    page_obj = posts_page(
-        request,
-        Post.objects.filter(author__following__user=request.user)
-    )
+    page_obj = posts_page(request, follow_timeline(request.user))
     return render(request, 'posts/follow.html', {
+        'page_obj': page_obj,
+        'recommended': recommended_authors(request.user),
+        'events_url': settings.SSE_PATH,
+    })
+
+
+@login_required
+def mention_list(request):
+    paginator = SeekPaginator(
+        request.user.mentions.select_related(
+            'author', 'post', 'comment'
+        ).defer('post__text'),
+        settings.PAGINATION_VALUE,
+    )
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = list(page_obj.object_list)
+    request.user.mentions.filter(
+        id__in=[mention.id for mention in page_obj if not mention.is_read]
+    ).update(is_read=True)
+    return render(request, 'posts/mentions.html', {
         'page_obj': page_obj
     })
 
@@ -126,3 +306,20 @@ def profile_unfollow(request, username):
         user=request.user
     ).delete()
     return redirect('posts:profile', username=username)
+
+
+@login_required
+def group_follow(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    GroupFollow.objects.get_or_create(group=group, user=request.user)
+    return redirect('posts:group_posts', slug=slug)
+
+
+@login_required
+def group_unfollow(request, slug):
+    get_object_or_404(
+        GroupFollow,
+        group__slug=slug,
+        user=request.user
+    ).delete()
+    return redirect('posts:group_posts', slug=slug)
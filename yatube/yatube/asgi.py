@@ -0,0 +1,30 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Django 2.2 has no native ASGI support, so the WSGI application is wrapped in
+``core.asgi.ASGIHandler``: network I/O runs on the event loop, views run in
+a bounded thread pool (``settings.ASGI_THREADS``). The server-sent events
+stream (``posts.events``) is a native async route served on the loop.
+"""
+
+import os
+from functools import partial
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+from django.conf import settings  # noqa: E402
+
+from core.asgi import ASGIHandler  # noqa: E402
+
+application = ASGIHandler(get_wsgi_application())
+
+from posts import counters, events  # noqa: E402
+
+counters.install()
+
+application.route(settings.SSE_PATH)(
+    partial(events.stream, run_sync=application.run_sync)
+)
@@ -0,0 +1,8 @@
+"""
+Settings package for yatube project.
+
+``yatube.settings`` is the development profile; production runs with
+``DJANGO_SETTINGS_MODULE=yatube.settings.prod``.
+"""
+
+from .dev import *  # noqa: F401,F403
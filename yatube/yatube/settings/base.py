@@ -0,0 +1,312 @@
+"""
+Base Django settings for yatube project, shared by the dev and prod profiles.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+Deployment-specific values are read from the environment.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+
+def env_bool(name, default=False):
+    return os.getenv(name, str(int(default))).lower() in ('1', 'true', 'yes')
+
+
+def env_list(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv('SECRET_KEY')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = env_bool('DEBUG')
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+])
+
+# Application definition
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'sorl.thumbnail',
+    'core.apps.CoreConfig',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.IdentityMapMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [TEMPLATES_DIR],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ]
+        },
+    }
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+ASGI_APPLICATION = 'yatube.asgi.application'
+
+ASGI_THREADS = 8
+
+# События SSE (posts.events): адрес потока, очередь событий соединения и
+# интервал пинга в секундах
+SSE_PATH = '/events/'
+
+PUBSUB_QUEUE_SIZE = 100
+
+SSE_HEARTBEAT = 15
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Сессии: 'cached_db' (чтение из кеша, запись в БД) или 'signed_cookies'
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv(
+    'SESSION_BACKEND', 'cached_db'
+)
+
+# Пользователь сессии читается из кеша (core.auth)
+AUTHENTICATION_BACKENDS = ['core.auth.CachedModelBackend']
+
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+# Пересчёт ключей кеша одним процессом (core.cache)
+CACHE_STALE_TIMEOUT = 60
+
+CACHE_LOCK_TIMEOUT = 10
+
+CACHE_EARLY_BETA = 1.0
+
+# Время жизни кеша главной и страниц групп и авторов
+POSTS_CACHE_TIMEOUT = 20
+
+# Кеш порций карточек для бесконечной прокрутки (posts.utils.posts_fragment)
+FRAGMENT_CACHE_TIMEOUT = 60
+
+# Страницы закрытых периодов (core.cache.permanent_page): max-age и срок в кеше
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Компактные ленты в кеше (posts.timelines)
+TIMELINE_LENGTH = 500
+
+TIMELINE_COMPRESS_MIN = 1024
+
+TIMELINE_POST_TIMEOUT = 60 * 60
+
+# Популярные теги (posts.tags)
+TRENDING_TAGS_HOURS = 24
+
+TRENDING_TAGS_LIMIT = 10
+
+TRENDING_TAGS_TIMEOUT = 60
+
+# Популярные посты (posts.trending): вес событий и затухание
+TRENDING_COMMENT_WEIGHT = 1.0
+
+TRENDING_FOLLOW_WEIGHT = 2.0
+
+TRENDING_VIEW_WEIGHT = 0.05
+
+TRENDING_HALF_LIFE = 6 * 60 * 60
+
+TRENDING_DECAY_INTERVAL = 10 * 60
+
+TRENDING_MIN_SCORE = 0.01
+
+TRENDING_POSTS_LIMIT = 50
+
+TRENDING_POSTS_TIMEOUT = 60
+
+# Словарь username → id для упоминаний (posts.mentions)
+MENTION_INDEX_TIMEOUT = 5 * 60
+
+# Счётчики просмотров (posts.counters): сброс буфера процесса в БД
+VIEW_FLUSH_INTERVAL = 30
+
+VIEW_FLUSH_SIZE = 1000
+
+VIEW_COUNT_TIMEOUT = 60
+
+# Лайки (posts.likes): шарды счётчика и кеш сумм и множеств лайков
+LIKE_SHARDS = 8
+
+LIKE_COUNT_TIMEOUT = 60
+
+LIKE_SET_TIMEOUT = 5 * 60
+
+# Рекомендации «кого почитать» (posts.recommendations)
+RECOMMEND_LIMIT = 5
+
+RECOMMEND_CACHE_TIMEOUT = 5 * 60
+
+# Кеш подписок пользователя (posts.following); None — без фильтра Блума
+FOLLOWING_TIMEOUT = 10 * 60
+
+FOLLOWING_BLOOM_MIN = 1000
+
+FOLLOWING_BLOOM_BITS_PER_ITEM = 10
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', "django.core.mail.backends.filebased.EmailBackend"
+)
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+
+LOGIN_REDIRECT_URL = ''
+
+LOGIN_URL = '/auth/login/'
+
+PAGINATION_VALUE = 10
+
+# Разреженный индекс для переходов на дальние страницы (posts.pagination)
+PAGINATION_SEEK_STEP = 1000
+
+PAGINATION_SEEK_TIMEOUT = 60 * 60
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+# Фоновые задачи (core.tasks): 'db', 'local' или 'eager'
+TASK_BROKER = os.getenv('TASK_BROKER', 'db')
+
+TASK_LOCAL_WORKERS = 2
+
+TASK_MAX_RETRIES = 3
+
+TASK_RETRY_DELAY = 1
+
+# Задача в статусе «выполняется» дольше этого числа секунд считается
+# брошенной (воркер упал) и захватывается снова.
+TASK_LEASE_TIMEOUT = 10 * 60
+
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+# Дайджест новых постов (posts.notifications)
+DIGEST_BATCH_SIZE = 100
+
+DIGEST_FIRST_PERIOD = 24 * 60 * 60
+
+# Посты моложе этого числа секунд ждут следующей рассылки: транзакция,
+# которая их сохраняет, могла ещё не завершиться.
+DIGEST_SAFETY_LAG = 60
+
+# Лента подписок (posts.feeds): 'hybrid' (push + pull) или 'pull'
+FEED_MODE = 'hybrid'
+
+FEED_FANOUT_THRESHOLD = 1000
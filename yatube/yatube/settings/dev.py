@@ -0,0 +1,10 @@
+"""
+Development settings for yatube project.
+"""
+
+from .base import *  # noqa: F401,F403
+from .base import SECRET_KEY, env_bool
+
+DEBUG = env_bool('DEBUG', default=True)
+
+SECRET_KEY = SECRET_KEY or '5pcu99gy$g7zxwtri&i1n3h^e!efyc6qr6&%1l5(kj6vlbva$w'
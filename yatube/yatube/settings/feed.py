@@ -0,0 +1,18 @@
+"""
+Settings for read-only feed workers.
+
+Based on the production profile; the admin is never installed, posts use
+the slim PostsFeedConfig without write-side signal handlers, and any
+unsafe HTTP method is rejected before it reaches a view.
+"""
+
+from .prod import *  # noqa: F401,F403
+from .prod import INSTALLED_APPS, MIDDLEWARE
+
+INSTALLED_APPS = [
+    'posts.apps.PostsFeedConfig' if app == 'posts.apps.PostsConfig' else app
+    for app in INSTALLED_APPS
+    if app != 'django.contrib.admin'
+]
+
+MIDDLEWARE = ['core.middleware.ReadOnlyMiddleware'] + MIDDLEWARE
@@ -0,0 +1,64 @@
+"""
+Production settings for yatube project.
+
+DEBUG is always off, so Django does not keep every SQL query in memory.
+Apps and middleware that are not used by the public pages (staticfiles —
+static files are served by the web server; admin and the messages
+framework it needs, unless ADMIN_ENABLED is set) are dropped from the
+request path. Templates are compiled once by the cached
+loader and warmed at startup (core.apps.CoreConfig).
+"""
+
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import (DATABASES, INSTALLED_APPS, MIDDLEWARE, SECRET_KEY,
+                   TEMPLATES, env_bool)
+
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Не задана переменная окружения SECRET_KEY')
+
+DEBUG = False
+
+ADMIN_ENABLED = env_bool('ADMIN_ENABLED')
+
+UNUSED_APPS = {'django.contrib.staticfiles'}
+
+CONTEXT_PROCESSORS = [
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+]
+
+if ADMIN_ENABLED:
+    # Админке нужны сообщения: приложение, middleware и контекст-процессор.
+    CONTEXT_PROCESSORS.append(
+        'django.contrib.messages.context_processors.messages'
+    )
+else:
+    UNUSED_APPS |= {'django.contrib.admin', 'django.contrib.messages'}
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware != (
+            'django.contrib.messages.middleware.MessageMiddleware'
+        )
+    ]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['context_processors'] = CONTEXT_PROCESSORS
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+TEMPLATES_WARMUP = True
+
+DATABASES = copy.deepcopy(DATABASES)
+DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))